@@ -0,0 +1,62 @@
+"""Game-ticks per second of the batched engine against the scalar engine.
+
+Steps BatchEngine with a growing number of games, relaunching finished
+rounds, and reports total game-ticks per second on one core next to a single
+BreakoutEngine. Run from the repository root:
+
+    python benchmarks/bench_batch.py --games 1000 10000 100000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+
+from breakout.batch import BatchEngine  # noqa: E402
+from breakout.engine import BreakoutEngine  # noqa: E402
+
+
+def time_batch(count, ticks, seed):
+    """Game-ticks per second for count games with a jittery tracking paddle"""
+    batch = BatchEngine(count)
+    jitter = np.random.default_rng(seed).integers(-60, 61, (16, count), dtype=np.int32)
+    centre = batch.ball_size // 2
+    start = time.perf_counter()
+    for tick in range(ticks):
+        if tick % 64 == 0:
+            batch.launch()
+        batch.step(batch.ball_x + centre + jitter[tick % 16])
+    return count * ticks / (time.perf_counter() - start)
+
+
+def time_scalar(ticks):
+    """Ticks per second for one BreakoutEngine with a tracking paddle"""
+    engine = BreakoutEngine(seed=0)
+    engine.launch()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if engine.step(engine.ball.rect.centerx) != 0:
+            engine.launch()
+    return ticks / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, nargs='+', default=[100, 1000, 10000, 100000])
+    parser.add_argument('--ticks', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    scalar = time_scalar(args.ticks * 20)
+    print(f'{"games":>8} {"game-ticks/s":>14} {"vs scalar":>10}')
+    print(f'{"scalar":>8} {scalar:>14,.0f} {1:>9.1f}x')
+    for count in args.games:
+        rate = time_batch(count, args.ticks, args.seed)
+        print(f'{count:>8} {rate:>14,.0f} {rate / scalar:>9.1f}x')
+
+
+if __name__ == '__main__':
+    main()
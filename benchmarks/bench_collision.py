@@ -0,0 +1,64 @@
+"""Per-tick cost of ball movement as the wall grows.
+
+Compares the grid-indexed ``game_ball.move`` with a full scan of every block,
+which is what each tick used to cost. Run from the repository root:
+
+    python benchmarks/bench_collision.py
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from breakout.engine import BreakoutEngine  # noqa: E402
+
+
+def make_engine(size):
+    """Engine with a size x size wall of small blocks on a matching board"""
+    width = max(600, size * 6)
+    block_height = max(3, 300 // size)
+    height = size * block_height + 300
+    engine = BreakoutEngine(cols=size, rows=size, width=width, height=height, block_height=block_height)
+    engine.launch()
+    return engine
+
+
+def time_indexed(engine, ticks):
+    """Seconds per tick for the engine's own move"""
+    start = time.perf_counter()
+    for _ in range(ticks):
+        if engine.step(engine.ball.rect.centerx) != 0:
+            engine.launch()
+    return (time.perf_counter() - start) / ticks
+
+
+def time_full_scan(engine, ticks):
+    """Seconds per tick to test the ball against every block"""
+    ball_rect = engine.ball.rect
+    wall = engine.wall
+    rects = [wall.block_rect(row, col) for row in range(wall.rows) for col in range(wall.cols)]
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for rect in rects:
+            ball_rect.colliderect(rect)
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[6, 25, 50, 100, 200])
+    parser.add_argument('--ticks', type=int, default=5000)
+    args = parser.parse_args()
+
+    print(f'{"wall":>9} {"blocks":>7} {"indexed us/tick":>16} {"full scan us/tick":>18}')
+    for size in args.sizes:
+        engine = make_engine(size)
+        indexed = time_indexed(engine, args.ticks)
+        scan = time_full_scan(engine, max(10, args.ticks // size))
+        print(f'{size:>4}x{size:<4} {size * size:>7} {indexed * 1e6:>16.2f} {scan * 1e6:>18.2f}')
+
+
+if __name__ == '__main__':
+    main()
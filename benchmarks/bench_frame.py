@@ -0,0 +1,214 @@
+"""Per-subsystem frame-time benchmark suite.
+
+Runs each stage of the main loop under stress scenarios with the SDL dummy
+video driver and reports per-call latency percentiles and throughput. Results
+can be saved as JSON and compared against an earlier run:
+
+    python benchmarks/bench_frame.py --output after.json --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+from breakout.engine import BreakoutEngine  # noqa: E402
+from breakout.particles import ParticlePool  # noqa: E402
+from breakout.render import Renderer  # noqa: E402
+from breakout.settings import screen_width, screen_height  # noqa: E402
+
+
+def percentile_summary(samples_ns):
+    """Latency percentiles in microseconds and calls per second"""
+    samples = np.asarray(samples_ns, dtype=np.float64) / 1000.0
+    p50, p90, p99 = np.percentile(samples, [50, 90, 99])
+    return {
+        'calls': len(samples),
+        'mean_us': float(samples.mean()),
+        'p50_us': float(p50),
+        'p90_us': float(p90),
+        'p99_us': float(p99),
+        'max_us': float(samples.max()),
+        'calls_per_s': float(1e6 / samples.mean()) if samples.mean() > 0 else float('inf'),
+    }
+
+
+def time_calls(func, iterations, before=None):
+    """Time iterations calls of func, running the untimed before hook first"""
+    clock = time.perf_counter_ns
+    samples = []
+    for _ in range(iterations):
+        if before is not None:
+            before()
+        start = clock()
+        func()
+        samples.append(clock() - start)
+    return samples
+
+
+def keep_live(engine):
+    """Untimed hook that restarts the round whenever it ends"""
+    def before():
+        if not engine.live_ball:
+            engine.launch()
+    return before
+
+
+def stage_timings(renderer, engine, iterations, stages=None, before=None):
+    """Benchmark each main-loop stage for one scenario"""
+    paddle_x = lambda: engine.ball.rect.centerx  # noqa: E731
+    all_stages = {
+        'draw_animated_background': renderer.draw_animated_background,
+        'update_particles': renderer.update_particles,
+        'draw_particles': renderer.draw_particles,
+        'draw_wall': lambda: renderer.draw_wall(engine.wall),
+        'draw_paddle': lambda: renderer.draw_paddle(engine.player_paddle),
+        'draw_ball': lambda: renderer.draw_balls(engine.balls),
+        'draw_ui': lambda: renderer.draw_ui(engine),
+        'engine_step': lambda: engine.step(paddle_x()),
+        'draw_scene': lambda: renderer.draw_scene(engine),
+    }
+    results = {}
+    for name, func in all_stages.items():
+        if stages is not None and name not in stages:
+            continue
+        hooks = [hook for hook in (before, keep_live(engine) if name == 'engine_step' else None) if hook]
+        hook = (lambda: [h() for h in hooks]) if hooks else None
+        results[name] = percentile_summary(time_calls(func, iterations, hook))
+    return results
+
+
+def scenario_full_wall(screen, iterations):
+    """Default 6x6 wall at the start of a round"""
+    engine = BreakoutEngine(seed=1)
+    engine.launch()
+    return stage_timings(Renderer(screen, seed=1), engine, iterations)
+
+
+def scenario_particles(screen, iterations, count=5000):
+    """Particle pool kept topped up at count live particles"""
+    engine = BreakoutEngine(seed=1)
+    engine.launch()
+    renderer = Renderer(screen, seed=1)
+    renderer.particles = ParticlePool(count, np.random.default_rng(1))
+
+    def refill():
+        missing = count - len(renderer.particles)
+        while missing > 0:
+            burst = min(missing, 8)
+            renderer.create_particles(300, 300, (255, 255, 255), burst)
+            missing -= burst
+
+    return stage_timings(renderer, engine, iterations, ['update_particles', 'draw_particles'], refill)
+
+
+def scenario_large_wall(screen, iterations, size=100):
+    """size x size wall of small blocks"""
+    block_height = max(3, 300 // size)
+    engine = BreakoutEngine(cols=size, rows=size, block_height=block_height, seed=1)
+    engine.launch()
+    return stage_timings(Renderer(screen, seed=1), engine, iterations,
+                         ['draw_wall', 'engine_step', 'draw_scene'])
+
+
+def scenario_menus(screen, iterations):
+    """Menu, victory and game over screens"""
+    results = {}
+    for name, game_over in (('menu', 0), ('victory', 1), ('game_over', -1)):
+        engine = BreakoutEngine(seed=1)
+        engine.game_over = game_over
+        renderer = Renderer(screen, seed=1)
+
+        def frame():
+            renderer.draw_scene(engine)
+            renderer.draw_state_screen(engine)
+
+        results[f'draw_state_screen[{name}]'] = percentile_summary(
+            time_calls(lambda: renderer.draw_state_screen(engine), iterations))
+        results[f'frame[{name}]'] = percentile_summary(time_calls(frame, iterations))
+    return results
+
+
+SCENARIOS = {
+    'full_wall': scenario_full_wall,
+    'particles_5000': scenario_particles,
+    'large_wall_100': scenario_large_wall,
+    'menus': scenario_menus,
+}
+
+
+def compare(results, baseline, threshold):
+    """Print p50 changes against a baseline run, returning the regressions"""
+    regressions = []
+    for scenario, stages in results['scenarios'].items():
+        for stage, stats in stages.items():
+            old = baseline.get('scenarios', {}).get(scenario, {}).get(stage)
+            if not old or old['p50_us'] <= 0:
+                continue
+            change = stats['p50_us'] / old['p50_us'] - 1.0
+            flag = ' REGRESSION' if change > threshold else ''
+            print(f'{scenario:>16} {stage:<32} {old["p50_us"]:>10.1f} -> {stats["p50_us"]:>10.1f} us '
+                  f'({change:+.0%}){flag}')
+            if flag:
+                regressions.append((scenario, stage, change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=500)
+    parser.add_argument('--scenarios', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--output', metavar='PATH', help='write results as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='baseline JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='relative p50 slowdown reported as a regression')
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode((screen_width, screen_height))
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'video_driver': pygame.display.get_driver(),
+            'iterations': args.iterations,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'scenarios': {},
+    }
+    for name in args.scenarios:
+        results['scenarios'][name] = SCENARIOS[name](screen, args.iterations)
+        print(f'\n{name}')
+        print(f'{"stage":<32} {"p50 us":>9} {"p90 us":>9} {"p99 us":>9} {"max us":>9} {"calls/s":>11}')
+        for stage, stats in results['scenarios'][name].items():
+            print(f'{stage:<32} {stats["p50_us"]:>9.1f} {stats["p90_us"]:>9.1f} {stats["p99_us"]:>9.1f} '
+                  f'{stats["max_us"]:>9.1f} {stats["calls_per_s"]:>11.0f}')
+
+    pygame.quit()
+
+    if args.output:
+        with open(args.output, 'w') as handle:
+            json.dump(results, handle, indent=2)
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        print()
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
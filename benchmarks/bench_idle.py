@@ -0,0 +1,65 @@
+"""CPU use of the idle menu screen, at the full frame rate and with idle pacing.
+
+Launches the game with the SDL dummy drivers and no input, so it sits on the
+start menu, once with ``--idle-fps 0`` (every frame drawn at the full rate,
+as before idle pacing) and once with the default idle frame rate. Each mode
+runs for a short and a long number of frames, and the differences in child
+CPU time and wall time between the two give the steady-state CPU share with
+interpreter start and the first second before going idle taken out. Run from
+the repository root:
+
+    python benchmarks/bench_idle.py --seconds 10
+"""
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_startup import GAME, ROOT, environment  # noqa: E402
+from breakout.settings import fps, idle_fps, idle_seconds  # noqa: E402
+
+
+def run_game(frames, frame_rate, env):
+    """Child CPU seconds and wall seconds for a game quitting after frames"""
+    before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+    subprocess.run([sys.executable, GAME, '--frames', str(frames), '--idle-fps', str(frame_rate)], env=env,
+                   cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wall = time.perf_counter() - start
+    after = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return after.ru_utime + after.ru_stime - before.ru_utime - before.ru_stime, wall
+
+
+def steady_state(frame_rate, seconds, env):
+    """CPU share and frames per second once the menu has been idle for a while"""
+    rate = frame_rate or fps
+    short = (idle_seconds + 1) * fps + rate
+    long = short + seconds * rate
+    cpu_short, wall_short = run_game(short, frame_rate, env)
+    cpu_long, wall_long = run_game(long, frame_rate, env)
+    wall = wall_long - wall_short
+    return (cpu_long - cpu_short) / wall, (long - short) / wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=int, default=10, help='idle time measured for each mode')
+    parser.add_argument('--idle-fps', type=int, default=idle_fps)
+    args = parser.parse_args()
+
+    modes = ((f'full rate ({fps} fps)', 0), (f'idle pacing ({args.idle_fps} fps)', args.idle_fps))
+    print(f'{"mode":<24} {"CPU %":>7} {"frames/s":>9}')
+    with tempfile.TemporaryDirectory() as directory:
+        env = environment(os.path.join(directory, 'fonts.json'))
+        for name, frame_rate in modes:
+            cpu, rate = steady_state(frame_rate, args.seconds, env)
+            print(f'{name:<24} {cpu * 100:>7.1f} {rate:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""Frame time of multi-ball play against the 60 fps budget.
+
+Keeps hundreds of balls in play on the standard 600x600 board and times the
+engine tick (broadphase included) and the scene render per frame, next to a
+brute-force test of every ball against every block and the snapshot that
+``--rewind`` records every tick, whose cost the last p99 column adds in. Run from the repository
+root with the SDL dummy driver:
+
+    python benchmarks/bench_multiball.py --balls 100 500
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+from breakout.engine import BreakoutEngine  # noqa: E402
+from breakout.render import Renderer  # noqa: E402
+from breakout.settings import screen_width, screen_height, fps, rewind_seconds  # noqa: E402
+from breakout.snapshot import RewindBuffer  # noqa: E402
+
+
+def fill_balls(engine, count):
+    """Launch if needed and split balls until count are in play"""
+    if not engine.live_ball:
+        engine.launch()
+    while len(engine.balls) < count:
+        engine.multiball_pending = 1
+        engine.split_balls()
+
+
+def brute_force(engine):
+    """Test every ball against every live block"""
+    wall = engine.wall
+    rects = [wall.block_rect(row, col) for row in range(wall.rows) for col in range(wall.cols)
+             if wall.strength_at(row, col)]
+    balls = engine.balls
+    for x, y in zip(balls.x[:balls.count].tolist(), balls.y[:balls.count].tolist()):
+        pygame.Rect(x, y, balls.width, balls.height).collidelistall(rects)
+
+
+def run(count, frames, swept, seed, warmup=100):
+    """Per-frame tick, render, brute-force and rewind record timings in milliseconds.
+
+    The first warmup frames are not timed, so every wall pulse phase and ball
+    sprite is already cached when timing starts.
+    """
+    surface = pygame.display.get_surface()
+    engine = BreakoutEngine(swept=swept, seed=seed, max_balls=count)
+    renderer = Renderer(surface, seed=seed)
+    history = RewindBuffer(engine, rewind_seconds * fps)
+    step, render, brute, record = [], [], [], []
+    clock = time.perf_counter
+    for frame in range(warmup + frames):
+        fill_balls(engine, count)
+        start = clock()
+        engine.step(engine.ball.rect.centerx)
+        renderer.handle_events(engine)
+        middle = clock()
+        renderer.draw_scene(engine)
+        end = clock()
+        brute_force(engine)
+        brute_end = clock()
+        history.record()
+        if frame < warmup:
+            continue
+        step.append(middle - start)
+        render.append(end - middle)
+        brute.append(brute_end - end)
+        record.append(clock() - brute_end)
+    return [np.asarray(samples) * 1000.0 for samples in (step, render, brute, record)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--balls', type=int, nargs='+', default=[10, 100, 500])
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=100, help='untimed frames before measuring')
+    parser.add_argument('--discrete', action='store_true', help='use the classic overlap collisions')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((screen_width, screen_height))
+    gc.freeze()
+    budget = 1000.0 / fps
+
+    print(f'frame budget {budget:.2f} ms, {"discrete" if args.discrete else "swept"} collisions')
+    print(f'{"balls":>6} {"tick ms":>9} {"render ms":>10} {"frame p99":>10} {"brute ms":>9} '
+          f'{"rewind ms":>10} {"+rewind p99":>12}  verdict')
+    for count in args.balls:
+        step, render, brute, record = run(count, args.frames, not args.discrete, args.seed, args.warmup)
+        frame_p99 = float(np.percentile(step + render, 99))
+        rewind_p99 = float(np.percentile(step + render + record, 99))
+        verdict = 'ok' if frame_p99 < budget else 'OVER BUDGET'
+        if rewind_p99 >= budget:
+            verdict += ', over with --rewind'
+        print(f'{count:>6} {step.mean():>9.3f} {render.mean():>10.3f} {frame_p99:>10.3f} '
+              f'{brute.mean():>9.3f} {record.mean():>10.3f} {rewind_p99:>12.3f}  {verdict}')
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
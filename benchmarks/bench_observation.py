@@ -0,0 +1,107 @@
+"""Observations per second of the pixel pipeline against copying the screen.
+
+Renders a game into the SDL dummy display and times, per observation, a
+``pygame.image.tobytes`` copy turned into an array, the zero-copy
+``screen_pixels`` view and ``ObservationPipeline`` in several
+configurations, then plays ``PixelGame`` with frame skip to time whole agent
+steps, rendering included. Run from the repository root:
+
+    python benchmarks/bench_observation.py --repeat 2000
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+from breakout.engine import BreakoutEngine  # noqa: E402
+from breakout.observation import ObservationPipeline, PixelGame, screen_pixels  # noqa: E402
+from breakout.render import Renderer  # noqa: E402
+from breakout.settings import screen_width, screen_height  # noqa: E402
+
+
+# (label, grayscale, downsample, stack)
+PIPELINES = [
+    ('rgb', False, 1, 1),
+    ('rgb /4', False, 4, 1),
+    ('gray', True, 1, 1),
+    ('gray /2 x4', True, 2, 4),
+    ('gray /4 x4', True, 4, 4),
+]
+
+
+def per_second(func, repeat):
+    """Calls per second and mean microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = time.perf_counter() - start
+    return repeat / elapsed, elapsed / repeat * 1e6
+
+
+def tobytes_copy(surface):
+    """Screen copied into a new (height, width, 3) array the way agents did before"""
+    width, height = surface.get_size()
+    return np.frombuffer(pygame.image.tobytes(surface, 'RGB'), np.uint8).reshape(height, width, 3)
+
+
+def screen_view(surface):
+    """Take and release the zero-copy view"""
+    pixels = screen_pixels(surface)
+    del pixels
+
+
+def play(frame_skip, repeat, seed):
+    """Agent steps per second of PixelGame following the ball"""
+    game = PixelGame(frame_skip=frame_skip, seed=seed)
+    game.reset()
+
+    def step():
+        if game.step(game.engine.ball.rect.centerx)[2]:
+            game.reset()
+    return per_second(step, repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=2000, help='observations timed per row')
+    parser.add_argument('--frame-skip', type=int, default=4)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((screen_width, screen_height))
+    engine = BreakoutEngine(seed=args.seed)
+    engine.launch()
+    renderer = Renderer(screen, seed=args.seed)
+    for _ in range(30):
+        engine.step(engine.ball.rect.centerx)
+        renderer.handle_events(engine)
+    renderer.draw_scene(engine)
+
+    rows = [('tobytes copy', lambda: tobytes_copy(screen), (screen_height, screen_width, 3)),
+            ('screen_pixels view', lambda: screen_view(screen), (screen_height, screen_width, 3))]
+    for label, grayscale, downsample, stack in PIPELINES:
+        pipeline = ObservationPipeline(screen, grayscale, downsample, stack)
+        rows.append((f'pipeline {label}', pipeline.observe, pipeline.shape))
+
+    print(f'{"observation":<24} {"shape":<18} {"obs/s":>10} {"us/obs":>9}')
+    for label, func, shape in rows:
+        rate, us = per_second(func, max(1, args.repeat // 10) if 'tobytes' in label else args.repeat)
+        print(f'{label:<24} {str(shape):<18} {rate:>10.0f} {us:>9.1f}')
+
+    rate, us = play(args.frame_skip, args.repeat, args.seed)
+    print(f'\nPixelGame, gray /4 x4, frame skip {args.frame_skip}: {rate:.0f} steps/s '
+          f'({rate * args.frame_skip:.0f} ticks/s), {us:.1f} us per step with rendering')
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
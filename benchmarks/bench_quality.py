@@ -0,0 +1,72 @@
+"""Render time per frame at every quality level.
+
+Plays a multi-ball game over a dense starfield and times ``handle_events``
+and ``draw_scene`` once per quality level, against the 60 fps budget, so
+the savings each step down buys are visible. Run from the repository root
+with the SDL dummy driver:
+
+    python benchmarks/bench_quality.py --balls 200 --stars 20000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+from bench_multiball import fill_balls  # noqa: E402
+from breakout.engine import BreakoutEngine  # noqa: E402
+from breakout.quality import QUALITY_LEVELS  # noqa: E402
+from breakout.render import Renderer  # noqa: E402
+from breakout.settings import screen_width, screen_height, fps  # noqa: E402
+
+
+def run(quality, count, stars, frames, seed, warmup=100):
+    """Render milliseconds per frame and the mean particle count at one quality level"""
+    surface = pygame.display.get_surface()
+    engine = BreakoutEngine(seed=seed, max_balls=count)
+    renderer = Renderer(surface, seed=seed, stars=stars, quality=quality)
+    render, particles = [], []
+    clock = time.perf_counter
+    for frame in range(warmup + frames):
+        fill_balls(engine, count)
+        engine.step(engine.ball.rect.centerx)
+        start = clock()
+        renderer.handle_events(engine)
+        renderer.draw_scene(engine)
+        if frame >= warmup:
+            render.append(clock() - start)
+            particles.append(len(renderer.particles))
+    return np.asarray(render) * 1000.0, float(np.mean(particles))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--balls', type=int, default=200)
+    parser.add_argument('--stars', type=int, default=20000)
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=100, help='untimed frames before measuring')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((screen_width, screen_height))
+    gc.freeze()
+
+    print(f'frame budget {1000.0 / fps:.2f} ms, {args.balls} balls, {args.stars} stars')
+    print(f'{"quality":<8} {"render ms":>10} {"p99 ms":>8} {"particles":>10}')
+    for quality in reversed(QUALITY_LEVELS):
+        render, particles = run(quality, args.balls, args.stars, args.frames, args.seed, args.warmup)
+        print(f'{quality.name:<8} {render.mean():>10.3f} {np.percentile(render, 99):>8.3f} {particles:>10.0f}')
+    pygame.quit()
+
+
+if __name__ == '__main__':
+    main()
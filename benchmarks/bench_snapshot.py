@@ -0,0 +1,74 @@
+"""Snapshot, restore and rewind cost, and the memory a rewind history needs.
+
+Plays games with 1, 100 and 500 balls, recording a snapshot into a rewind
+buffer after every tick, and reports the mean time of ``snapshot``,
+``restore``, ``RewindBuffer.record`` and a one-tick rewind, the snapshot
+size and the bytes held by a full history of ``rewind_seconds``. Run from
+the repository root:
+
+    python benchmarks/bench_snapshot.py --balls 1 100 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from bench_multiball import fill_balls  # noqa: E402
+from breakout.engine import BreakoutEngine  # noqa: E402
+from breakout.settings import fps, rewind_seconds  # noqa: E402
+from breakout.snapshot import RewindBuffer, restore, snapshot  # noqa: E402
+
+
+def mean_us(func, repeat):
+    """Mean microseconds per call"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def run(count, ticks, seed):
+    """Timings and sizes for a game held at count balls"""
+    engine = BreakoutEngine(swept=True, seed=seed, max_balls=count, multiball_chance=0.01 if count > 1 else 0.0)
+    history = RewindBuffer(engine, rewind_seconds * fps)
+    record = 0.0
+    for _ in range(ticks):
+        fill_balls(engine, count)
+        engine.step(engine.ball.rect.centerx)
+        start = time.perf_counter()
+        history.record()
+        record += time.perf_counter() - start
+
+    state = snapshot(engine)
+    history_bytes = history.nbytes
+    repeat = max(10, 20000 // count)
+    return {
+        'snapshot_us': mean_us(lambda: snapshot(engine), repeat),
+        'restore_us': mean_us(lambda: restore(engine, state), repeat),
+        'record_us': record / ticks * 1e6,
+        'rewind_us': mean_us(lambda: history.rewind(1), min(repeat, len(history) - 1)),
+        'snapshot_bytes': len(state),
+        'history_bytes': history_bytes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--balls', type=int, nargs='+', default=[1, 100, 500])
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    ticks = rewind_seconds * fps + 1
+    print(f'{"balls":>6} {"snapshot us":>12} {"restore us":>11} {"record us":>10} {"rewind us":>10} '
+          f'{"snapshot B":>11} {f"{rewind_seconds}s history KB":>16}')
+    for count in args.balls:
+        result = run(count, ticks, args.seed)
+        print(f'{count:>6} {result["snapshot_us"]:>12.1f} {result["restore_us"]:>11.1f} '
+              f'{result["record_us"]:>10.1f} {result["rewind_us"]:>10.1f} {result["snapshot_bytes"]:>11} '
+              f'{result["history_bytes"] / 1024:>16.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""Starfield frame cost as the star count grows.
+
+Times one update and draw of the background starfield per frame for 20 up to
+20000 stars, next to the per-star ``pygame.draw.circle`` loop it replaces, on
+a screen-sized surface with the SDL dummy video driver. Run from the
+repository root:
+
+    python benchmarks/bench_starfield.py --size 1920x1080
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import numpy as np  # noqa: E402
+import pygame  # noqa: E402
+
+from breakout.palette import SINE_MASK, star_pulse  # noqa: E402
+from breakout.settings import star_layers  # noqa: E402
+from breakout.starfield import Starfield  # noqa: E402
+
+
+def draw_circles(starfield, ticks):
+    """The old background: one draw call per star"""
+    colors = star_pulse.colors
+    pulse = star_pulse.index(ticks)
+    surface = starfield.target
+    for x, y, size, phase in zip(starfield.x.tolist(), starfield.y.tolist(), starfield.size.tolist(),
+                                 starfield.phase.tolist()):
+        pygame.draw.circle(surface, colors[(pulse + phase) & SINE_MASK], (x, int(y)), size)
+
+
+def time_frames(starfield, frames, draw):
+    """Mean milliseconds per update and draw"""
+    start = time.perf_counter()
+    for ticks in range(frames):
+        starfield.update()
+        draw(ticks * 16)
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', default='600x600', help='surface size as WIDTHxHEIGHT')
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--counts', type=int, nargs='+', default=[20, 200, 2000, 20000])
+    args = parser.parse_args()
+
+    width, height = (int(value) for value in args.size.split('x'))
+    surface = pygame.Surface((width, height), 0, 32)
+
+    print(f'{"stars":>7} {"starfield ms":>13} {"per star us":>12} {"circles ms":>11}')
+    for count in args.counts:
+        starfield = Starfield(surface, count, star_layers, np.random.default_rng(0))
+        vectorized = time_frames(starfield, args.frames, starfield.draw)
+        circles = time_frames(starfield, args.frames, lambda ticks: draw_circles(starfield, ticks))
+        print(f'{count:>7} {vectorized:>13.3f} {vectorized / count * 1000:>12.3f} {circles:>11.3f}')
+
+
+if __name__ == '__main__':
+    main()
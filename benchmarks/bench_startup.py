@@ -0,0 +1,102 @@
+"""Startup time: time to first frame and the slowest imports.
+
+Launches the game with the SDL dummy drivers and ``--frames 1``, so each
+run covers interpreter start, imports, window and renderer setup and one
+full frame. Runs alternate between a cold font cache (a fresh, empty cache
+file) and a warm one, and a bare interpreter and a bare ``import pygame``
+are timed for reference. One more run under ``python -X importtime``
+lists the imports with the largest cumulative time. Run from the
+repository root:
+
+    python benchmarks/bench_startup.py --runs 10 --importtime-output importtime.txt
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+GAME = os.path.join(ROOT, 'Break_Out_game.py')
+
+
+def environment(font_cache):
+    """Child environment with dummy SDL drivers and its own font cache"""
+    env = dict(os.environ)
+    env.setdefault('SDL_VIDEODRIVER', 'dummy')
+    env.setdefault('SDL_AUDIODRIVER', 'dummy')
+    env['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'
+    env['BREAKOUT_FONT_CACHE'] = font_cache
+    return env
+
+
+def time_process(args, env):
+    """Wall-clock milliseconds for a child process to start, run and exit"""
+    start = time.perf_counter()
+    subprocess.run(args, env=env, cwd=ROOT, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def parse_importtime(output):
+    """(self_us, cumulative_us, depth, module) for every line of -X importtime output"""
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        module = name.rstrip()
+        imports.append((int(self_us), int(cumulative_us), (len(module) - len(module.lstrip())) // 2,
+                        module.strip()))
+    return imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='timed runs of each kind')
+    parser.add_argument('--top', type=int, default=15, help='imports listed by cumulative time')
+    parser.add_argument('--importtime-output', metavar='PATH', help='save the raw -X importtime output')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = os.path.join(directory, 'fonts.json')
+        env = environment(cache)
+        game = [sys.executable, GAME, '--frames', '1']
+        reference = {
+            'interpreter': [sys.executable, '-c', 'pass'],
+            'import pygame': [sys.executable, '-c', 'import pygame'],
+        }
+
+        timings = {name: [] for name in list(reference) + ['first frame (cold font cache)',
+                                                          'first frame (warm font cache)']}
+        for _ in range(args.runs):
+            for name, command in reference.items():
+                timings[name].append(time_process(command, env))
+            if os.path.exists(cache):
+                os.remove(cache)
+            timings['first frame (cold font cache)'].append(time_process(game, env))
+            timings['first frame (warm font cache)'].append(time_process(game, env))
+
+        print(f'{"":<32} {"median ms":>10} {"min ms":>8}')
+        for name, samples in timings.items():
+            print(f'{name:<32} {statistics.median(samples):>10.1f} {min(samples):>8.1f}')
+
+        result = subprocess.run([sys.executable, '-X', 'importtime'] + game[1:], env=env, cwd=ROOT,
+                                check=True, capture_output=True, text=True)
+
+    if args.importtime_output:
+        with open(args.importtime_output, 'w') as handle:
+            handle.write(result.stderr)
+
+    imports = parse_importtime(result.stderr)
+    print(f'\nTotal import time {sum(entry[0] for entry in imports) / 1000:.1f} ms; '
+          f'slowest top-level imports:')
+    print(f'{"module":<40} {"cumulative ms":>14} {"self ms":>8}')
+    top_level = sorted((entry for entry in imports if entry[2] == 0), key=lambda entry: -entry[1])
+    for self_us, cumulative_us, _, module in top_level[:args.top]:
+        print(f'{module:<40} {cumulative_us / 1000:>14.1f} {self_us / 1000:>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""Tournament throughput as the worker pool grows.
+
+Plays the same set of games with 1, 2, 4, ... worker processes up to the
+core count and reports games per second and parallel efficiency relative to
+a single worker. Run from the repository root:
+
+    python benchmarks/bench_tournament.py --games 200
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from breakout.tournament import POLICIES, run  # noqa: E402
+
+
+def worker_counts(limit):
+    """Powers of two up to limit, always ending with limit itself"""
+    counts = []
+    workers = 1
+    while workers < limit:
+        counts.append(workers)
+        workers *= 2
+    counts.append(limit)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--games', type=int, default=200, help='games per policy')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    policies = sorted(POLICIES)
+    print(f'{"workers":>8} {"games/s":>9} {"speedup":>8} {"efficiency":>11}')
+    base = None
+    for workers in worker_counts(args.max_workers):
+        start = time.perf_counter()
+        results = run(policies, args.games, workers=workers)
+        rate = len(results) / (time.perf_counter() - start)
+        base = base or rate
+        print(f'{workers:>8} {rate:>9.1f} {rate / base:>7.2f}x {rate / base / workers:>10.0%}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,4 @@
+"""Breakout - Interactive Edition"""
+from .engine import BreakoutEngine
+
+__all__ = ['BreakoutEngine']
@@ -0,0 +1,331 @@
+"""Vectorized engine stepping many independent games at once.
+
+``BatchEngine`` keeps the ball, paddle, wall and scoring state of N games in
+NumPy arrays and advances every game one tick per ``step`` call, following
+the classic ``game_ball.move`` rules (discrete collisions with the 5 pixel
+side threshold). It is meant for bot training and balancing runs that need
+millions of ticks; ``check`` compares it tick by tick against
+``BreakoutEngine``:
+
+    python -m breakout.batch check --envs 64 --ticks 5000
+"""
+import argparse
+import sys
+
+import numpy as np
+
+from .engine import BreakoutEngine, default_layout
+from .settings import screen_width, screen_height, cols, rows, fps
+
+
+class BatchEngine:
+    """N Breakout games stepped together, one array element per game.
+
+    Games share the board geometry, layout and tick counter but keep their
+    own ball, paddle, blocks, score, combo and round state. ``step`` takes
+    one paddle target per game; games whose round has ended stay idle until
+    ``launch`` restarts them, just like ``BreakoutEngine``.
+    """
+    # Side distance within which a block or paddle contact flips the ball
+    collision_thresh = 5
+
+    def __init__(self, count, cols=cols, rows=rows, width=screen_width, height=screen_height, fps=fps,
+                 block_height=50, ball_speed=4, layout=None, paddle_width=None):
+        self.count = count
+        self.cols = cols
+        self.rows = rows
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.ball_speed = ball_speed
+        self.block_width = width // cols
+        self.block_height = block_height
+        self.layout = np.frombuffer(layout if layout is not None else default_layout(cols, rows),
+                                    dtype=np.uint8, count=cols * rows)
+        self.ticks = 0
+
+        # Paddle geometry matches paddle.reset()
+        self.paddle_width = paddle_width if paddle_width else int(width / cols)
+        self.paddle_height = 20
+        self.paddle_start = int((width / 2) - (self.paddle_width / 2))
+        self.paddle_y = height - self.paddle_height * 2
+
+        # Ball geometry matches game_ball.reset() at the serve position
+        self.ball_size = 20
+        self.serve_x = self.paddle_start + self.paddle_width // 2 - self.ball_size // 2
+        self.serve_y = self.paddle_y - self.paddle_height
+
+        # Largest number of block cells one ball can overlap, per axis
+        self.span_cols = (self.ball_size - 1) // self.block_width + 2
+        self.span_rows = (self.ball_size - 1) // self.block_height + 2
+
+        self.strength = np.tile(self.layout, count)
+        self.cell_offset = np.arange(count, dtype=np.int64) * (cols * rows)
+        self.blocks_remaining = np.full(count, np.count_nonzero(self.layout), dtype=np.int32)
+        self.paddle_x = np.full(count, self.paddle_start, dtype=np.int32)
+        self.direction = np.zeros(count, dtype=np.int32)
+        self.ball_x = np.full(count, self.serve_x, dtype=np.int32)
+        self.ball_y = np.full(count, self.serve_y, dtype=np.int32)
+        self.speed_x = np.full(count, ball_speed, dtype=np.int32)
+        self.speed_y = np.full(count, -ball_speed, dtype=np.int32)
+        self.speed_max = np.full(count, ball_speed + 1, dtype=np.int32)
+        self.live = np.zeros(count, dtype=bool)
+        self.game_over = np.zeros(count, dtype=np.int8)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.blocks_destroyed = np.zeros(count, dtype=np.int32)
+        self.combo_count = np.zeros(count, dtype=np.int32)
+        self.last_hit_time = np.zeros(count, dtype=np.int64)
+
+    @classmethod
+    def from_engine(cls, count, engine):
+        """Batch of games with the same rules and board as a discrete BreakoutEngine.
+
+        Raises ValueError for swept or multi-ball engines, whose rules the
+        batch does not follow.
+        """
+        if engine.swept:
+            raise ValueError('BatchEngine only follows discrete collisions, not swept=True')
+        if engine.multiball_chance > 0:
+            raise ValueError('BatchEngine plays a single ball per game, not multiball_chance > 0')
+        return cls(count, engine.cols, engine.rows, engine.width, engine.height, engine.fps,
+                   engine.wall.height, engine.ball_speed, bytes(engine.wall.layout),
+                   engine.player_paddle.paddle_width)
+
+    @property
+    def time_ms(self):
+        """Simulation time in milliseconds"""
+        return self.ticks * 1000 // self.fps
+
+    def block_state(self, game):
+        """Current strength of every block of one game as bytes"""
+        start = game * self.cols * self.rows
+        return self.strength[start:start + self.cols * self.rows].tobytes()
+
+    def launch(self, games=None):
+        """Start a round in the given games (all by default) that are not already live"""
+        mask = ~self.live
+        if games is not None:
+            selected = np.zeros(self.count, dtype=bool)
+            selected[games] = True
+            mask &= selected
+        if not mask.any():
+            return
+
+        # Game state reset on restart
+        restart = mask & (self.game_over != 0)
+        self.score[restart] = 0
+        self.blocks_destroyed[restart] = 0
+        self.combo_count[restart] = 0
+
+        self.live |= mask
+        self.game_over[mask] = 0
+        self.ball_x[mask] = self.serve_x
+        self.ball_y[mask] = self.serve_y
+        self.speed_x[mask] = self.ball_speed
+        self.speed_y[mask] = -self.ball_speed
+        self.speed_max[mask] = self.ball_speed + 1
+        self.paddle_x[mask] = self.paddle_start
+        self.direction[mask] = 0
+        self.strength.reshape(self.count, -1)[mask] = self.layout
+        self.blocks_remaining[mask] = np.count_nonzero(self.layout)
+
+    def step(self, paddle_x):
+        """Advance every game one tick with each paddle centred on its paddle_x.
+
+        Returns the per-game round result: 1 for a cleared wall, -1 for a
+        lost ball and 0 while the round is running or not yet launched.
+        """
+        self.ticks += 1
+        live = np.nonzero(self.live)[0]
+        if not len(live):
+            return self.game_over
+
+        self.move_paddles(live, np.asarray(paddle_x, dtype=np.int32)[live])
+        self.move_balls(live)
+
+        ended = live[self.game_over[live] != 0]
+        self.live[ended] = False
+        return self.game_over
+
+    def move_paddles(self, live, target_x):
+        """Centre the live paddles on their targets, clamped to the board"""
+        prev_x = self.paddle_x[live]
+        x = np.clip(target_x - self.paddle_width // 2, 0, self.width - self.paddle_width)
+        self.paddle_x[live] = x
+        self.direction[live] = np.sign(x - prev_x)
+
+    def move_balls(self, live):
+        """One tick of game_ball.move for every live game"""
+        thresh = self.collision_thresh
+        size = self.ball_size
+        x = self.ball_x[live]
+        y = self.ball_y[live]
+        speed_x = self.speed_x[live]
+        speed_y = self.speed_y[live]
+        hit_block = np.zeros(len(live), dtype=bool)
+
+        # Block collision detection and destruction, visiting cells in row-major order
+        col_start = np.maximum(0, x // self.block_width)
+        col_end = np.minimum(self.cols - 1, (x + size - 1) // self.block_width)
+        row_start = np.maximum(0, y // self.block_height)
+        row_end = np.minimum(self.rows - 1, (y + size - 1) // self.block_height)
+        near = np.nonzero((row_start <= row_end) & (col_start <= col_end))[0]
+        if len(near):
+            for row_offset in range(self.span_rows):
+                for col_offset in range(self.span_cols):
+                    row = row_start[near] + row_offset
+                    col = col_start[near] + col_offset
+                    inside = (row <= row_end[near]) & (col <= col_end[near])
+                    cell = self.cell_offset[live[near]] + row * self.cols + col
+                    inside[inside] = self.strength[cell[inside]] > 0
+                    if inside.any():
+                        games = near[inside]
+                        self.hit_blocks(live, games, row[inside], col[inside], cell[inside],
+                                        x, y, speed_x, speed_y)
+                        hit_block[games] = True
+
+        # Reset combo timer
+        now = self.time_ms
+        expired = live[~hit_block]
+        expired = expired[now - self.last_hit_time[expired] > 1000]
+        self.combo_count[expired] = 0
+
+        # Victory condition check
+        game_over = np.where(self.blocks_remaining[live] == 0, 1, 0).astype(np.int8)
+
+        # Wall boundary collisions
+        speed_x = np.where((x < 0) | (x + size > self.width), -speed_x, speed_x)
+
+        # Ceiling and floor collisions
+        speed_y = np.where(y < 0, -speed_y, speed_y)
+        game_over[y + size > self.height] = -1
+
+        # Paddle collision with enhanced physics
+        paddle_x = self.paddle_x[live]
+        touching = ((x < paddle_x + self.paddle_width) & (x + size > paddle_x)
+                    & (y < self.paddle_y + self.paddle_height) & (y + size > self.paddle_y))
+        bounce = touching & (np.abs(y + size - self.paddle_y) < thresh) & (speed_y > 0)
+        speed_max = self.speed_max[live]
+        spin_x = np.clip(speed_x + self.direction[live], -speed_max, speed_max)
+        speed_x = np.where(bounce, spin_x, np.where(touching, -speed_x, speed_x))
+        speed_y = np.where(bounce, -speed_y, speed_y)
+
+        self.ball_x[live] = x + speed_x
+        self.ball_y[live] = y + speed_y
+        self.speed_x[live] = speed_x
+        self.speed_y[live] = speed_y
+        self.game_over[live] = game_over
+
+    def hit_blocks(self, live, games, row, col, cell, x, y, speed_x, speed_y):
+        """Bounce and damage one live block for each listed game.
+
+        ``games`` index the per-live-game arrays x, y, speed_x and speed_y,
+        which are updated in place.
+        """
+        thresh = self.collision_thresh
+        size = self.ball_size
+        top = row * self.block_height
+        left = col * self.block_width
+        bx = x[games]
+        by = y[games]
+
+        # Collision direction detection and response
+        sy = speed_y[games]
+        sy = np.where((np.abs(by + size - top) < thresh) & (sy > 0), -sy, sy)
+        sy = np.where((np.abs(by - (top + self.block_height)) < thresh) & (sy < 0), -sy, sy)
+        speed_y[games] = sy
+        sx = speed_x[games]
+        sx = np.where((np.abs(bx + size - left) < thresh) & (sx > 0), -sx, sx)
+        sx = np.where((np.abs(bx - (left + self.block_width)) < thresh) & (sx < 0), -sx, sx)
+        speed_x[games] = sx
+
+        # Scoring based on block type
+        game = live[games]
+        strength = self.strength[cell]
+        points = np.where(strength == 3, 30, np.where(strength == 2, 20, 10))
+        damaged = strength > 1
+        self.strength[cell] = np.where(damaged, strength - 1, 0)
+        self.score[game] += np.where(damaged, points // 2, points)
+
+        # Destroyed blocks and the combo system
+        destroyed = game[~damaged]
+        if len(destroyed):
+            now = self.time_ms
+            self.blocks_remaining[destroyed] -= 1
+            self.blocks_destroyed[destroyed] += 1
+            combo = np.where(now - self.last_hit_time[destroyed] < 1000, self.combo_count[destroyed] + 1, 1)
+            self.combo_count[destroyed] = combo
+            self.last_hit_time[destroyed] = now
+            self.score[destroyed] += np.where(combo > 1, combo * 5, 0)
+
+
+def compare(batch, engines, game):
+    """Names of the state fields where a batch game differs from its scalar engine"""
+    engine = engines[game]
+    ball = engine.ball
+    pairs = {
+        'score': (batch.score[game], engine.score),
+        'game_over': (batch.game_over[game], engine.game_over),
+        'live': (batch.live[game], engine.live_ball),
+        'ball': ((batch.ball_x[game], batch.ball_y[game]), (ball.rect.x, ball.rect.y)),
+        'speed': ((batch.speed_x[game], batch.speed_y[game]), (ball.speed_x, ball.speed_y)),
+        'paddle': (batch.paddle_x[game], engine.player_paddle.rect.x),
+        'combo': ((batch.combo_count[game], batch.last_hit_time[game]),
+                  (engine.combo_count, engine.last_hit_time)),
+        'blocks': (batch.block_state(game), engine.block_state()),
+        'destroyed': ((batch.blocks_destroyed[game], batch.blocks_remaining[game]),
+                      (engine.blocks_destroyed, engine.wall.blocks_remaining)),
+    }
+    return [name for name, (batched, scalar) in pairs.items() if np.any(np.asarray(batched) != np.asarray(scalar))]
+
+
+def check(count=64, ticks=5000, seed=0, **config):
+    """Step a batch and count scalar engines with the same inputs, comparing every tick.
+
+    Paddles follow their ball with random jitter and occasional random
+    jumps, and every ended round is relaunched. Returns (tick, game, fields)
+    for the first mismatch, or None when the runs agree.
+    """
+    rng = np.random.default_rng(seed)
+    engines = [BreakoutEngine(seed=seed + game, **config) for game in range(count)]
+    batch = BatchEngine.from_engine(count, engines[0])
+    for tick in range(1, ticks + 1):
+        idle = np.nonzero(~batch.live)[0]
+        if len(idle):
+            batch.launch(idle)
+            for game in idle.tolist():
+                engines[game].launch()
+
+        jitter = rng.integers(-60, 61, count)
+        jump = rng.random(count) < 0.02
+        paddle_x = np.where(jump, rng.integers(-100, batch.width + 100, count),
+                            batch.ball_x + batch.ball_size // 2 + jitter)
+        batch.step(paddle_x)
+        for game, engine in enumerate(engines):
+            engine.step(int(paddle_x[game]))
+            fields = compare(batch, engines, game)
+            if fields:
+                return tick, game, fields
+    return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check the batched engine against BreakoutEngine')
+    parser.add_argument('command', choices=['check'])
+    parser.add_argument('--envs', type=int, default=64)
+    parser.add_argument('--ticks', type=int, default=5000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--ball-speed', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    mismatch = check(args.envs, args.ticks, args.seed, ball_speed=args.ball_speed)
+    if mismatch is not None:
+        tick, game, fields = mismatch
+        print(f'MISMATCH at tick {tick} in game {game}: {", ".join(fields)}')
+        return 1
+    print(f'OK: {args.envs} games matched BreakoutEngine for {args.ticks} ticks')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
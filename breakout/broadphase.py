@@ -0,0 +1,95 @@
+"""Sort-and-sweep broadphase for many balls"""
+import numpy as np
+
+
+def expand_ranges(starts, counts):
+    """Owner index and value for every element of the ranges [start, start + count)"""
+    counts = np.maximum(counts, 0)
+    owners = np.repeat(np.arange(len(counts)), counts)
+    offsets = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+    return owners, starts[owners] + offsets
+
+
+class SortAndSweep:
+    """Finds overlapping pairs between balls, wall blocks and the paddle.
+
+    Ball boxes are sorted along x once per tick (reusing the previous order,
+    which is nearly sorted from frame to frame) and swept against the other
+    sorted interval lists: the wall's column and row edges, the paddle and,
+    optionally, the balls themselves. Only the pairs whose intervals overlap
+    on both axes reach the per-ball narrowphase, so no ball is tested against
+    every block.
+    """
+    def __init__(self):
+        self.order = None
+        self.edges = {}
+
+    def sort(self, x0):
+        """Ball indices ordered by left edge"""
+        if self.order is None or len(self.order) != len(x0):
+            self.order = np.argsort(x0, kind='stable')
+        else:
+            # Insertion-friendly re-sort of last tick's order
+            self.order = self.order[np.argsort(x0[self.order], kind='stable')]
+        return self.order
+
+    @staticmethod
+    def boxes(balls, margin=0):
+        """Left, top, right and bottom edges of every ball, grown by a scalar or per-ball margin"""
+        count = len(balls)
+        x0 = np.fromiter((ball.rect.x for ball in balls), np.int32, count)
+        y0 = np.fromiter((ball.rect.y for ball in balls), np.int32, count)
+        width = balls[0].rect.width if count else 0
+        height = balls[0].rect.height if count else 0
+        return x0 - margin, y0 - margin, x0 + width + margin, y0 + height + margin
+
+    def block_pairs(self, x0, y0, x1, y1, wall):
+        """(ball, row, col) of live blocks overlapped by each ball box.
+
+        Column and row edges of the wall are already sorted, so each ball's
+        overlapping span falls out of a binary search of its interval
+        endpoints. Pairs come back grouped by ball and row-major within a
+        ball, the order the single-ball collision loop uses.
+        """
+        geometry = (wall.cols, wall.rows, wall.width, wall.height)
+        edges = self.edges.get(geometry)
+        if edges is None:
+            edges = self.edges[geometry] = ((np.arange(wall.cols) + 1) * wall.width, np.arange(wall.cols) * wall.width,
+                                            (np.arange(wall.rows) + 1) * wall.height, np.arange(wall.rows) * wall.height)
+        col_right, col_left, row_bottom, row_top = edges
+
+        c0 = np.searchsorted(col_right, x0, 'right')
+        c1 = np.searchsorted(col_left, x1, 'left') - 1
+        r0 = np.searchsorted(row_bottom, y0, 'right')
+        r1 = np.searchsorted(row_top, y1, 'left') - 1
+        ncols = np.maximum(c1 - c0 + 1, 0)
+        nrows = np.maximum(r1 - r0 + 1, 0)
+
+        owners, cells = expand_ranges(np.zeros(len(x0), dtype=np.int64), ncols * nrows)
+        span = ncols[owners]
+        cols = c0[owners] + cells % np.maximum(span, 1)
+        rows = r0[owners] + cells // np.maximum(span, 1)
+        live = wall.grid[rows, cols] > 0
+        return owners[live], rows[live], cols[live]
+
+    def paddle_hits(self, x0, y0, x1, y1, rect):
+        """Balls whose boxes overlap the paddle rect"""
+        order = self.sort(x0)
+        # Every ball that starts left of the paddle's right edge, in sweep order
+        reach = order[:np.searchsorted(x0[order], rect.right, 'left')]
+        overlap = (x1[reach] > rect.left) & (y0[reach] < rect.bottom) & (y1[reach] > rect.top)
+        return reach[overlap]
+
+    def ball_pairs(self, x0, y0, x1, y1, order=None):
+        """(i, j) pairs of boxes that overlap, sweeping them in order of x0 (sorted here when not given)"""
+        if order is None:
+            order = self.sort(x0)
+        sorted_x0 = x0[order]
+        # Each ball overlaps the following balls that start before it ends
+        ends = np.searchsorted(sorted_x0, x1[order], 'left')
+        starts = np.arange(len(order)) + 1
+        owners, others = expand_ranges(starts, ends - starts)
+        first = order[owners]
+        second = order[others]
+        overlap = (y0[first] < y1[second]) & (y0[second] < y1[first])
+        return first[overlap], second[overlap]
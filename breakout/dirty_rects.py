@@ -0,0 +1,63 @@
+"""Dirty-rectangle display updates"""
+import numpy as np
+import pygame
+
+
+class DirtyRects:
+    """Collects the screen regions drawn each frame and updates only those.
+
+    A region must be pushed both in the frame it is drawn and in the next one,
+    so whatever it covered gets restored once it moves away. When the dirty
+    area grows past ``full_threshold`` of the screen a single full update is
+    cheaper than many small ones and is used instead. The dirty area is that
+    of the union of the regions, so a region dirty in both frames, like the
+    pulsing wall, counts once.
+    """
+    def __init__(self, screen_rect, full_threshold=0.6):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.full_threshold = full_threshold
+        self.current = []
+        self.previous = []
+        self.full_update = True
+        # Screen coverage scratch for measuring overlapping regions
+        self.covered = np.zeros((self.screen_rect.height, self.screen_rect.width), dtype=bool)
+
+    def add(self, rects):
+        """Mark a rect, or a list of rects, as redrawn this frame"""
+        if rects is None:
+            return
+        if isinstance(rects, pygame.Rect):
+            self.current.append(rects)
+        else:
+            self.current.extend(rect for rect in rects if rect is not None)
+
+    def invalidate(self):
+        """Force a full-screen update on the next flush"""
+        self.full_update = True
+
+    def union_area(self, rects):
+        """Pixels covered by at least one of rects"""
+        covered = self.covered
+        covered[:] = False
+        left, top = self.screen_rect.topleft
+        for x, y, width, height in rects:
+            covered[y - top:y - top + height, x - left:x - left + width] = True
+        return int(np.count_nonzero(covered))
+
+    def flush(self):
+        """Push this frame's dirty regions to the display"""
+        # Regions pushed in both frames, such as the wall, appear once
+        rects = [pygame.Rect(rect) for rect in dict.fromkeys(
+            tuple(rect.clip(self.screen_rect)) for rect in self.previous + self.current)]
+        limit = self.full_threshold * self.screen_rect.width * self.screen_rect.height
+        # Summed areas bound the union from above, so it is only measured when they cross the limit
+        area = sum(rect.width * rect.height for rect in rects)
+        if area > limit:
+            area = self.union_area(rects)
+        if self.full_update or area > limit:
+            pygame.display.update()
+        elif rects:
+            pygame.display.update(rects)
+        self.full_update = False
+        self.previous = self.current
+        self.current = []
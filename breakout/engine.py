@@ -0,0 +1,897 @@
+"""Headless Breakout simulation, independent of any display"""
+import random
+
+import numpy as np
+from pygame import Rect
+
+from .broadphase import SortAndSweep, expand_ranges
+from .physics import sweep_aabb
+from .spatial import BlockGrid
+from .settings import screen_width, screen_height, cols, rows, fps, trail_length
+
+
+# Engine event kinds consumed by renderers
+EVENT_BLOCK_HIT = 'block_hit'
+EVENT_PADDLE_HIT = 'paddle_hit'
+
+
+class LevelError(Exception):
+    """Raised for malformed level files and levels that do not fit the board"""
+
+
+def default_layout(cols, rows):
+    """Classic layout: two rows each of 3, 2 and then 1 hit blocks"""
+    strength = np.ones((rows, cols), dtype=np.uint8)
+    strength[:4] = 2
+    strength[:2] = 3
+    return strength.tobytes()
+
+
+class wall():
+    """Manages the destructible block wall.
+
+    Block state is one strength byte per block in a flat row-major
+    ``bytearray`` (0 for destroyed blocks), and block rects are computed from
+    the grid geometry on demand. ``layout`` holds the strengths the wall is
+    reset to and may be any bytes-like object, such as a memory-mapped level.
+    """
+    def __init__(self, cols=cols, rows=rows, board_width=screen_width, block_height=50, layout=None):
+        self.cols = cols
+        self.rows = rows
+        self.width = board_width // cols
+        self.height = block_height
+        self.generation = 0
+        self.layout = layout if layout is not None else default_layout(cols, rows)
+        self.strength = bytearray(cols * rows)
+        self.index = BlockGrid(self.width, self.height, self.cols, self.rows, self.strength)
+        self.blocks_remaining = 0
+
+    def create_wall(self):
+        """Reset every block to the wall's layout"""
+        self.generation += 1
+        self.strength[:] = self.layout
+        self.blocks_remaining = int(np.count_nonzero(self.grid))
+
+    @property
+    def grid(self):
+        """Strengths as a (rows, cols) NumPy view sharing the wall's memory"""
+        return np.frombuffer(self.strength, dtype=np.uint8).reshape(self.rows, self.cols)
+
+    def strength_at(self, row, col):
+        """Strength of a block, 0 once it is destroyed"""
+        return self.strength[row * self.cols + col]
+
+    def block_rect(self, row, col):
+        """Screen rect of the block at row, col"""
+        return Rect(col * self.width, row * self.height, self.width, self.height)
+
+    def destroy_block(self, row, col):
+        """Remove a block from play"""
+        self.strength[row * self.cols + col] = 0
+        self.blocks_remaining -= 1
+
+
+class paddle():
+    """Player-controlled paddle"""
+    def __init__(self, board_width=screen_width, board_height=screen_height, width=screen_width // cols):
+        self.board_width = board_width
+        self.board_height = board_height
+        self.paddle_width = width
+        self.reset()
+
+    def move(self, target_x):
+        """Update paddle position so its centre follows target_x"""
+        prev_x = self.rect.x
+
+        self.rect.x = target_x - (self.width // 2)
+
+        # Screen boundary constraints
+        if self.rect.left < 0:
+            self.rect.left = 0
+        if self.rect.right > self.board_width:
+            self.rect.right = self.board_width
+
+        # Movement direction calculation for ball physics
+        if self.rect.x > prev_x:
+            self.direction = 1
+        elif self.rect.x < prev_x:
+            self.direction = -1
+        else:
+            self.direction = 0
+
+    def reset(self):
+        """Initialize paddle properties"""
+        self.height = 20
+        self.width = self.paddle_width
+        self.x = int((self.board_width / 2) - (self.width / 2))
+        self.y = self.board_height - (self.height * 2)
+        self.speed = 10
+        self.rect = Rect(self.x, self.y, self.width, self.height)
+        self.direction = 0
+
+
+class game_ball():
+    """Game ball with physics and collision detection"""
+    def __init__(self, x, y, speed=4):
+        self.reset(x, y, speed)
+
+    def move(self, engine, blocks=None, near_paddle=True):
+        """Update ball position and handle all collisions.
+
+        ``blocks`` and ``near_paddle`` let a broadphase supply the candidate
+        blocks and rule out the paddle; by default the wall index is queried.
+        """
+        wall = engine.wall
+        player_paddle = engine.player_paddle
+        self.prev_x = self.rect.x
+        self.prev_y = self.rect.y
+
+        collision_thresh = 5
+        hit_block = False
+
+        # Block collision detection and destruction
+        if blocks is None:
+            blocks = wall.index.query(self.rect)
+        else:
+            blocks = [block for block in blocks if wall.strength_at(*block)]
+        for row_count, item_count in blocks:
+            block_rect = wall.block_rect(row_count, item_count)
+            if self.rect.colliderect(block_rect):
+                hit_block = True
+
+                # Collision direction detection and response
+                if abs(self.rect.bottom - block_rect.top) < collision_thresh and self.speed_y > 0:
+                    self.speed_y *= -1
+                if abs(self.rect.top - block_rect.bottom) < collision_thresh and self.speed_y < 0:
+                    self.speed_y *= -1
+                if abs(self.rect.right - block_rect.left) < collision_thresh and self.speed_x > 0:
+                    self.speed_x *= -1
+                if abs(self.rect.left - block_rect.right) < collision_thresh and self.speed_x < 0:
+                    self.speed_x *= -1
+
+                engine.damage_block(row_count, item_count)
+
+        # Reset combo timer
+        if not hit_block:
+            engine.expire_combo()
+
+        # Victory condition check
+        if wall.blocks_remaining == 0:
+            self.game_over = 1
+
+        # Wall boundary collisions
+        if self.rect.left < 0 or self.rect.right > engine.width:
+            self.speed_x *= -1
+
+        # Ceiling and floor collisions
+        if self.rect.top < 0:
+            self.speed_y *= -1
+        if self.rect.bottom > engine.height:
+            self.game_over = -1
+
+        # Paddle collision with enhanced physics
+        if near_paddle and self.rect.colliderect(player_paddle.rect):
+            if abs(self.rect.bottom - player_paddle.rect.top) < collision_thresh and self.speed_y > 0:
+                self.bounce_off_paddle(engine)
+            else:
+                self.speed_x *= -1
+
+        self.rect.x += self.speed_x
+        self.rect.y += self.speed_y
+        self.fx = float(self.rect.x)
+        self.fy = float(self.rect.y)
+
+        return self.game_over
+
+    def move_swept(self, engine, blocks=None, near_paddle=True):
+        """Update ball position with continuous collision detection.
+
+        The tick is split into ``engine.substeps`` sub-moves. Each sub-move
+        sweeps the ball's box along its velocity and resolves the earliest
+        contact with the board edges, blocks or paddle before moving on, so
+        a fast ball cannot tunnel through a block or pick the wrong side.
+        ``blocks`` and ``near_paddle`` work as in ``move``.
+        """
+        self.prev_x = self.fx
+        self.prev_y = self.fy
+
+        self.resolve_overlaps(engine, near_paddle)
+        hit_block = False
+        for _ in range(engine.substeps):
+            hit_block |= self.sweep(engine, 1.0 / engine.substeps, blocks, near_paddle)
+            if self.game_over == -1:
+                break
+
+        # Reset combo timer
+        if not hit_block:
+            engine.expire_combo()
+
+        # Victory condition check
+        if engine.wall.blocks_remaining == 0 and self.game_over == 0:
+            self.game_over = 1
+
+        return self.game_over
+
+    def resolve_overlaps(self, engine, near_paddle=True):
+        """Push the ball back into play when it starts a tick overlapping something"""
+        if self.fx < 0 and self.speed_x < 0 or self.fx + self.rect.width > engine.width and self.speed_x > 0:
+            self.speed_x *= -1
+        if self.fy < 0 and self.speed_y < 0:
+            self.speed_y *= -1
+
+        # The paddle may have been moved into the ball
+        paddle_rect = engine.player_paddle.rect
+        if near_paddle and self.rect.colliderect(paddle_rect):
+            if self.speed_y > 0 and self.rect.centery < paddle_rect.top:
+                self.fy = float(paddle_rect.top - self.rect.height)
+                self.rect.y = paddle_rect.top - self.rect.height
+                self.bounce_off_paddle(engine)
+            elif (self.rect.centerx < paddle_rect.centerx) == (self.speed_x > 0):
+                self.speed_x *= -1
+
+    def sweep(self, engine, fraction, blocks=None, near_paddle=True):
+        """Move the ball through one sub-step, bouncing at each contact.
+
+        Returns True if a block was hit.
+        """
+        wall = engine.wall
+        paddle_rect = engine.player_paddle.rect
+        width = self.rect.width
+        height = self.rect.height
+        hit_block = False
+
+        # Each contact consumes part of the remaining time
+        for _ in range(4):
+            dx = self.speed_x * fraction
+            dy = self.speed_y * fraction
+            if dx == 0 and dy == 0:
+                break
+            best_t = 1.0
+            hits = []
+
+            # Board edges
+            if dx < 0 and self.fx + dx < 0:
+                best_t, hits = self.earliest(best_t, hits, -self.fx / dx, ('edge', True, False))
+            elif dx > 0 and self.fx + width + dx > engine.width:
+                best_t, hits = self.earliest(best_t, hits, (engine.width - width - self.fx) / dx,
+                                             ('edge', True, False))
+            if dy < 0 and self.fy + dy < 0:
+                best_t, hits = self.earliest(best_t, hits, -self.fy / dy, ('edge', False, True))
+
+            # Blocks overlapped by the swept box
+            if blocks is None:
+                sweep_rect = Rect(int(min(self.fx, self.fx + dx)), int(min(self.fy, self.fy + dy)),
+                                  int(abs(dx)) + width + 2, int(abs(dy)) + height + 2)
+                candidates = wall.index.query(sweep_rect)
+            else:
+                candidates = [block for block in blocks if wall.strength_at(*block)]
+            for row, col in candidates:
+                contact = sweep_aabb(self.fx, self.fy, width, height, dx, dy,
+                                     col * wall.width, row * wall.height, wall.width, wall.height)
+                if contact is not None:
+                    best_t, hits = self.earliest(best_t, hits, contact[0], ('block', contact[1], contact[2], row, col))
+
+            # Paddle
+            contact = near_paddle and sweep_aabb(self.fx, self.fy, width, height, dx, dy,
+                                                 paddle_rect.x, paddle_rect.y, paddle_rect.width,
+                                                 paddle_rect.height)
+            if contact:
+                best_t, hits = self.earliest(best_t, hits, contact[0], ('paddle', contact[1], contact[2]))
+
+            self.fx += dx * best_t
+            self.fy += dy * best_t
+            self.rect.x = round(self.fx)
+            self.rect.y = round(self.fy)
+            if not hits:
+                break
+
+            # Bounce once per axis even when several things were touched at once
+            flip_x = any(hit[1] for hit in hits)
+            flip_y = any(hit[2] for hit in hits)
+            for hit in hits:
+                if hit[0] == 'block':
+                    hit_block = True
+                    engine.damage_block(hit[3], hit[4])
+                elif hit[0] == 'paddle' and hit[2] and self.speed_y > 0:
+                    self.bounce_off_paddle(engine)
+                    flip_y = False
+            if flip_x:
+                self.speed_x *= -1
+            if flip_y:
+                self.speed_y *= -1
+            fraction *= 1.0 - best_t
+
+        # Floor collision
+        if self.fy + height > engine.height:
+            self.game_over = -1
+        return hit_block
+
+    @staticmethod
+    def earliest(best_t, hits, t, hit):
+        """Keep the contacts that happen first, collecting simultaneous ones"""
+        if t < best_t - 1e-9:
+            return t, [hit]
+        if t <= best_t + 1e-9:
+            hits.append(hit)
+        return best_t, hits
+
+    def bounce_off_paddle(self, engine):
+        """Bounce up off the paddle, picking up spin from its movement"""
+        player_paddle = engine.player_paddle
+        self.speed_y *= -1
+        self.speed_x += player_paddle.direction
+        if self.speed_x > self.speed_max:
+            self.speed_x = self.speed_max
+        elif self.speed_x < 0 and self.speed_x < -self.speed_max:
+            self.speed_x = -self.speed_max
+
+        engine.events.append((EVENT_PADDLE_HIT, self.rect.centerx, self.rect.centery))
+
+    def split(self, rng):
+        """New ball leaving this one's position upwards at a random angle"""
+        speed = abs(self.speed_y)
+        ball = game_ball(self.rect.centerx, self.rect.y, speed)
+        ball.fx = ball.prev_x = self.fx
+        ball.fy = ball.prev_y = self.fy
+        ball.speed_x = rng.choice((-1, 1)) * rng.randint(1, ball.speed_max)
+        ball.speed_y = -speed
+        return ball
+
+    def position(self, alpha=1.0):
+        """Top-left corner interpolated between the last two simulated states"""
+        return (self.prev_x + (self.fx - self.prev_x) * alpha,
+                self.prev_y + (self.fy - self.prev_y) * alpha)
+
+    def reset(self, x, y, speed=4):
+        """Initialize ball properties and position"""
+        self.ball_rad = 10
+        self.x = x - self.ball_rad
+        self.y = y
+        self.rect = Rect(self.x, self.y, self.ball_rad * 2, self.ball_rad * 2)
+        self.fx = self.prev_x = float(self.x)
+        self.fy = self.prev_y = float(self.y)
+        self.speed_x = speed
+        self.speed_y = -speed
+        self.speed_max = speed + 1
+        self.game_over = 0
+
+
+class BallArrays:
+    """Every ball in play as structure-of-arrays, the layout BatchEngine keeps its games in.
+
+    Slots ``0 .. count - 1`` hold the balls in play, so free balls move in one
+    NumPy pass over each field. Scalar physics runs on a ``game_ball`` filled
+    by ``load`` and written back by ``store``, which go through memoryviews of
+    the same arrays because they index several times faster than NumPy.
+    Indexing or iterating gives ``game_ball`` copies of the slots.
+
+    Every ball adds a trail point each tick, so the trails share one ring
+    position: ball i's newest point is ``trail[i, head - 1]`` and it has
+    ``trail_count[i]`` points going back from there.
+    """
+    def __init__(self, capacity, radius=10):
+        self.capacity = capacity
+        self.radius = radius
+        self.width = self.height = radius * 2
+        self.count = 0
+        self.x = np.zeros(capacity, np.int32)
+        self.y = np.zeros(capacity, np.int32)
+        self.fx = np.zeros(capacity)
+        self.fy = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)
+        self.prev_y = np.zeros(capacity)
+        self.speed_x = np.zeros(capacity, np.int32)
+        self.speed_y = np.zeros(capacity, np.int32)
+        self.speed_max = np.zeros(capacity, np.int32)
+        self.game_over = np.zeros(capacity, np.int8)
+        self.trail = np.zeros((capacity, trail_length, 2), np.int32)
+        self.trail_count = np.zeros(capacity, np.int32)
+        self.head = 0
+        self.fields = (self.x, self.y, self.fx, self.fy, self.prev_x, self.prev_y, self.speed_x, self.speed_y,
+                       self.speed_max, self.game_over, self.trail_count, self.trail)
+        self.slots = tuple(memoryview(values.reshape(-1)) for values in self.fields)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not -self.count <= index < self.count:
+            raise IndexError('ball index out of range')
+        ball = game_ball(0, 0)
+        self.load(index % self.count, ball)
+        return ball
+
+    def load(self, i, ball):
+        """Copy slot i into a game_ball"""
+        x, y, fx, fy, prev_x, prev_y, speed_x, speed_y, speed_max, game_over, _, _ = self.slots
+        rect = ball.rect
+        rect.x = x[i]
+        rect.y = y[i]
+        ball.fx = fx[i]
+        ball.fy = fy[i]
+        ball.prev_x = prev_x[i]
+        ball.prev_y = prev_y[i]
+        ball.speed_x = speed_x[i]
+        ball.speed_y = speed_y[i]
+        ball.speed_max = speed_max[i]
+        ball.game_over = game_over[i]
+
+    def store(self, i, ball):
+        """Copy a game_ball into slot i"""
+        x, y, fx, fy, prev_x, prev_y, speed_x, speed_y, speed_max, game_over, _, _ = self.slots
+        rect = ball.rect
+        x[i] = rect.x
+        y[i] = rect.y
+        fx[i] = ball.fx
+        fy[i] = ball.fy
+        prev_x[i] = ball.prev_x
+        prev_y[i] = ball.prev_y
+        speed_x[i] = ball.speed_x
+        speed_y[i] = ball.speed_y
+        speed_max[i] = ball.speed_max
+        game_over[i] = ball.game_over
+
+    def append(self, ball):
+        """Add a ball with an empty trail in the next free slot"""
+        i = self.count
+        self.store(i, ball)
+        self.trail_count[i] = 0
+        self.count += 1
+
+    def keep(self, mask):
+        """Drop the balls where mask is False, closing up the slots in order"""
+        count = int(np.count_nonzero(mask))
+        for values in self.fields:
+            values[:count] = values[:self.count][mask]
+        self.count = count
+
+    def push_trails(self):
+        """Add every ball's current centre to its trail"""
+        count = self.count
+        head = self.head
+        if count == 1:
+            # A lone ball is cheaper through the memoryviews than through NumPy
+            x, y = self.slots[:2]
+            trail_count, trail = self.slots[10:]
+            trail[head * 2] = x[0] + self.width // 2
+            trail[head * 2 + 1] = y[0] + self.height // 2
+            if trail_count[0] < trail_length:
+                trail_count[0] += 1
+        else:
+            self.trail[:count, head, 0] = self.x[:count] + self.width // 2
+            self.trail[:count, head, 1] = self.y[:count] + self.height // 2
+            np.minimum(self.trail_count[:count] + 1, trail_length, out=self.trail_count[:count])
+        self.head = (head + 1) % trail_length
+
+    def trail_points(self, newest):
+        """(count, newest, 2) array of every ball's last newest trail points, oldest first"""
+        ring = (self.head - newest + np.arange(newest)) % trail_length
+        return self.trail[:self.count][:, ring]
+
+    def reach(self):
+        """Left, top, right and bottom of the area every ball sweeps on a straight path this tick.
+
+        Boxes run from the ball's exact position to a pixel past its travel,
+        which covers the rounding of the sub-step sums. They stop at the
+        trailing edges, where ``sweep_aabb`` reports no contact.
+        """
+        count = self.count
+        fx = self.fx[:count]
+        fy = self.fy[:count]
+        speed_x = self.speed_x[:count]
+        speed_y = self.speed_y[:count]
+        travel_x = speed_x + np.sign(speed_x)
+        travel_y = speed_y + np.sign(speed_y)
+        return (fx + np.minimum(travel_x, 0), fy + np.minimum(travel_y, 0),
+                fx + (self.width + np.maximum(travel_x, 0)), fy + (self.height + np.maximum(travel_y, 0)))
+
+    def boxes(self, margin=0):
+        """Left, top, right and bottom edges of every ball, grown by a scalar or per-ball margin"""
+        x0 = self.x[:self.count]
+        y0 = self.y[:self.count]
+        return x0 - margin, y0 - margin, x0 + (self.width + margin), y0 + (self.height + margin)
+
+
+class BreakoutEngine:
+    """Complete game state stepped one tick at a time with explicit paddle input.
+
+    The engine owns the wall, paddle, ball, score, combo and game-over state
+    and never touches the display, so it can run thousands of ticks per second
+    for bots, regression tests and balancing. Time is counted in ticks of
+    ``1 / fps`` seconds, which keeps combo timing independent of the wall clock.
+    Visual side effects are reported through ``events`` for the current tick.
+
+    With ``swept=True`` the ball uses continuous collision detection split
+    into ``substeps`` sub-moves per tick; otherwise it uses the classic
+    overlap test with a 5 pixel side threshold.
+
+    Destroying a block triggers the multi-ball power-up with probability
+    ``multiball_chance``, adding ``multiball_count`` balls for every ball in
+    play up to ``max_balls``. Balls live in ``BallArrays``; several are moved
+    with a sort-and-sweep broadphase and, with ``ball_collisions``, bounce off
+    each other.
+
+    Any randomness in the rules must come from ``rng``, seeded from ``seed``,
+    so that a seed plus the per-tick paddle input reproduces a game exactly.
+    """
+    def __init__(self, cols=cols, rows=rows, width=screen_width, height=screen_height, fps=fps,
+                 block_height=50, swept=False, substeps=1, ball_speed=4, seed=None, layout=None,
+                 paddle_width=None, multiball_chance=0.0, multiball_count=2, max_balls=500,
+                 ball_collisions=True):
+        self.cols = cols
+        self.rows = rows
+        self.width = width
+        self.height = height
+        self.fps = fps
+        self.swept = swept
+        self.substeps = max(1, substeps)
+        self.ball_speed = ball_speed
+        self.multiball_chance = multiball_chance
+        self.multiball_count = multiball_count
+        self.max_balls = max(1, max_balls)
+        self.ball_collisions = ball_collisions
+        self.seed = seed if seed is not None else random.randrange(2 ** 63)
+        self.rng = random.Random(self.seed)
+
+        self.wall = wall(cols, rows, width, block_height, layout)
+        self.wall.create_wall()
+        self.player_paddle = paddle(width, height, paddle_width if paddle_width else int(width / cols))
+        self.balls = BallArrays(self.max_balls)
+        self.balls.append(game_ball(*self.serve_position(), ball_speed))
+        self.worker = game_ball(0, 0)
+        self.broadphase = SortAndSweep()
+        self.multiball_pending = 0
+
+        self.live_ball = False
+        self.game_over = 0
+        self.score = 0
+        self.level = 1
+        self.blocks_destroyed = 0
+        self.combo_count = 0
+        self.last_hit_time = 0
+        self.ticks = 0
+        self.events = []
+
+    @classmethod
+    def from_level(cls, level, width=None, height=None, **kwargs):
+        """Engine playing a loaded level, scaled to fit a board width when one is given.
+
+        With a board height as well, blocks are flattened as needed to keep the
+        wall in the top half, clear of the paddle and the serve. Raises
+        LevelError when the blocks would end up under a pixel in either axis.
+        """
+        level_width = level.cols * level.block_width
+        if width is None:
+            width = level_width
+        if width // level.cols < 1:
+            raise LevelError(f'{level.cols} columns do not fit a {width} px wide board')
+        block_height = max(1, level.block_height * width // level_width)
+        if height is None:
+            height = level.rows * block_height + 300
+        else:
+            block_height = min(block_height, height // 2 // level.rows)
+            if block_height < 1:
+                raise LevelError(f'{level.rows} rows do not fit a {height} px tall board')
+        kwargs.setdefault('paddle_width', width // 6)
+        return cls(cols=level.cols, rows=level.rows, width=width, height=height,
+                   block_height=block_height, layout=level.strength, **kwargs)
+
+    @property
+    def ball(self):
+        """Copy of the first ball in play, the only one outside multi-ball"""
+        return self.balls[0]
+
+    @property
+    def time_ms(self):
+        """Simulation time in milliseconds"""
+        return self.ticks * 1000 // self.fps
+
+    def block_state(self):
+        """Current strength of every block as bytes, 0 for destroyed blocks"""
+        return bytes(self.wall.strength)
+
+    def serve_position(self):
+        """Ball start position above the paddle centre"""
+        return (self.player_paddle.x + (self.player_paddle.width // 2),
+                self.player_paddle.y - self.player_paddle.height)
+
+    def damage_block(self, row, col):
+        """Apply one hit to a block, scoring it and tracking combos"""
+        block_strength = self.wall.strength_at(row, col)
+
+        # Scoring based on block type
+        if block_strength == 3:
+            points = 30
+        elif block_strength == 2:
+            points = 20
+        else:
+            points = 10
+
+        self.events.append((EVENT_BLOCK_HIT, col * self.wall.width + self.wall.width // 2,
+                            row * self.wall.height + self.wall.height // 2, block_strength, row, col))
+
+        # Block damage and destruction logic
+        if block_strength > 1:
+            self.wall.strength[row * self.wall.cols + col] = block_strength - 1
+            self.score += points // 2
+        else:
+            self.wall.destroy_block(row, col)
+            self.score += points
+            self.blocks_destroyed += 1
+
+            # Combo system for consecutive hits
+            current_time = self.time_ms
+            if current_time - self.last_hit_time < 1000:
+                self.combo_count += 1
+            else:
+                self.combo_count = 1
+            self.last_hit_time = current_time
+
+            # Bonus scoring for combos
+            if self.combo_count > 1:
+                self.score += self.combo_count * 5
+
+            # Multi-ball power-up, rolled only when enabled to keep other games' RNG streams unchanged
+            if self.multiball_chance > 0 and self.rng.random() < self.multiball_chance:
+                self.multiball_pending += 1
+
+    def expire_combo(self):
+        """Drop the combo once a second has passed without a block destroyed"""
+        if self.time_ms - self.last_hit_time > 1000:
+            self.combo_count = 0
+
+    def launch(self):
+        """Start a round, resetting the game first if the previous one ended"""
+        if self.live_ball:
+            return
+        self.live_ball = True
+        # Game state reset on restart
+        if self.game_over != 0:
+            self.score = 0
+            self.blocks_destroyed = 0
+            self.combo_count = 0
+            self.level = 1
+        self.game_over = 0
+        self.multiball_pending = 0
+        self.player_paddle.reset()
+        self.balls.count = 0
+        self.balls.append(game_ball(*self.serve_position(), self.ball_speed))
+        self.wall.create_wall()
+
+    def step(self, paddle_x):
+        """Advance the simulation one tick with the paddle centred on paddle_x"""
+        self.events.clear()
+        self.ticks += 1
+
+        # Active gameplay logic
+        if self.live_ball:
+            self.player_paddle.move(paddle_x)
+            self.balls.push_trails()
+            if len(self.balls) > 1:
+                self.game_over = self.move_balls()
+            else:
+                self.game_over = self.move_ball()
+            if self.multiball_pending and self.game_over == 0:
+                self.split_balls()
+            if self.game_over != 0:
+                self.live_ball = False
+
+        return self.game_over
+
+    def move_ball(self):
+        """Move the only ball in play with the scalar physics"""
+        ball = self.worker
+        self.balls.load(0, ball)
+        game_over = ball.move_swept(self) if self.swept else ball.move(self)
+        self.balls.store(0, ball)
+        return game_over
+
+    def move_balls(self):
+        """Move every ball, in one vectorized pass for those the broadphase finds clear.
+
+        Balls whose boxes touch a live block or the paddle, or swept balls that
+        may reach a board edge, take the scalar physics one at a time with the
+        broadphase's candidate blocks. Swept boxes reach only ahead of each
+        ball, since a ball that touches nothing on its way cannot bounce. Returns 1 once the wall is cleared, -1
+        when the last ball is lost and 0 otherwise. Lost balls leave play.
+        """
+        balls = self.balls
+        count = balls.count
+        broadphase = self.broadphase
+        speed_x = balls.speed_x[:count]
+        speed_y = balls.speed_y[:count]
+
+        # Boxes of everything each ball could touch on a straight path this tick
+        x0, y0, x1, y1 = balls.reach() if self.swept else balls.boxes()
+        owners, block_rows, block_cols = broadphase.block_pairs(x0, y0, x1, y1, self.wall)
+        near_paddle = np.zeros(count, dtype=bool)
+        near_paddle[broadphase.paddle_hits(x0, y0, x1, y1, self.player_paddle.rect)] = True
+        open_path = ~near_paddle
+        if self.swept:
+            open_path &= (x0 >= 0) & (y0 >= 0) & (x1 <= self.width) & (y1 <= self.height)
+        free = open_path & (np.bincount(owners, minlength=count) == 0)
+
+        if self.swept and not free.all():
+            # A bounce can turn a swept ball around, so the rest look a tick's travel out all round
+            near = np.flatnonzero(~free)
+            margin = np.maximum(np.abs(speed_x[near]), np.abs(speed_y[near])) + 2
+            x0 = balls.x[near] - margin
+            y0 = balls.y[near] - margin
+            x1 = x0 + (balls.width + 2 * margin)
+            y1 = y0 + (balls.height + 2 * margin)
+            owners, block_rows, block_cols = broadphase.block_pairs(x0, y0, x1, y1, self.wall)
+            owners = near[owners]
+            rect = self.player_paddle.rect
+            near_paddle[near] = (x0 < rect.right) & (x1 > rect.left) & (y0 < rect.bottom) & (y1 > rect.top)
+
+        # Scalar physics for the balls near something, in slot order. Once the balls before it
+        # have destroyed all its blocks, a ball with an open path joins the vectorized pass
+        candidates = {}
+        for owner, row, col in zip(owners.tolist(), block_rows.tolist(), block_cols.tolist()):
+            candidates.setdefault(owner, []).append((row, col))
+        strength = self.wall.strength
+        cols = self.wall.cols
+        ball = self.worker
+        move = ball.move_swept if self.swept else ball.move
+        near = near_paddle.tolist()
+        opened = open_path.tolist()
+        for i in np.flatnonzero(~free).tolist():
+            blocks = candidates.get(i, ())
+            if opened[i] and not any(strength[row * cols + col] for row, col in blocks):
+                free[i] = True
+                continue
+            balls.load(i, ball)
+            move(self, blocks, near[i])
+            balls.store(i, ball)
+
+        if free.any():
+            self.fly(free)
+            self.expire_combo()
+
+        if self.ball_collisions:
+            self.collide_balls()
+
+        if self.wall.blocks_remaining == 0:
+            game_over = balls.game_over[:count]
+            game_over[game_over == 0] = 1
+            return 1
+        in_play = balls.game_over[:count] != -1
+        if not in_play.any():
+            balls.count = 1
+            return -1
+        if not in_play.all():
+            balls.keep(in_play)
+        return 0
+
+    def fly(self, free):
+        """Move the balls in the free mask, which touch nothing this tick, in one pass.
+
+        Positions match what the scalar ``move`` or ``move_swept`` would give
+        with no contacts, bit for bit.
+        """
+        balls = self.balls
+        count = balls.count
+        x = balls.x[:count]
+        y = balls.y[:count]
+        speed_x = balls.speed_x[:count][free]
+        speed_y = balls.speed_y[:count][free]
+        if self.swept:
+            # Same sub-step sums as sweep, so positions match it exactly
+            fx = balls.fx[:count][free]
+            fy = balls.fy[:count][free]
+            balls.prev_x[:count][free] = fx
+            balls.prev_y[:count][free] = fy
+            fraction = 1.0 / self.substeps
+            dx = speed_x * fraction
+            dy = speed_y * fraction
+            for _ in range(self.substeps):
+                fx += dx
+                fy += dy
+            balls.fx[:count][free] = fx
+            balls.fy[:count][free] = fy
+            x[free] = np.rint(fx)
+            y[free] = np.rint(fy)
+            return
+
+        # Classic rules: bounce off the side walls and ceiling, leave play through the floor
+        left = x[free]
+        top = y[free]
+        balls.prev_x[:count][free] = left
+        balls.prev_y[:count][free] = top
+        speed_x = np.where((left < 0) | (left + balls.width > self.width), -speed_x, speed_x)
+        speed_y = np.where(top < 0, -speed_y, speed_y)
+        balls.game_over[:count][free] = np.where(top + balls.height > self.height, -1,
+                                                 balls.game_over[:count][free])
+        balls.speed_x[:count][free] = speed_x
+        balls.speed_y[:count][free] = speed_y
+        x[free] = left + speed_x
+        y[free] = top + speed_y
+        balls.fx[:count][free] = x[free]
+        balls.fy[:count][free] = y[free]
+
+    def collide_balls(self):
+        """Bounce overlapping balls that are moving towards each other.
+
+        Balls sharing a position and velocity meet every other ball alike and
+        never bounce off each other, so pairs are found between these kinds
+        of ball and only the bouncing ones are expanded back to balls. A
+        freshly split clump of hundreds of balls is a handful of kinds.
+        """
+        balls = self.balls
+        count = balls.count
+        x = balls.x[:count]
+        y = balls.y[:count]
+        speed_x = balls.speed_x[:count]
+        speed_y = balls.speed_y[:count]
+        order = self.broadphase.sort(x)
+
+        if count > 64:
+            # Keys put x above y and the speeds, which fit 16 bits, so kinds come back sorted along x
+            key = ((x.astype(np.int64) << 16 | y & 0xffff) << 16 | speed_x & 0xffff) << 16 | speed_y & 0xffff
+            _, sample, kind, sizes = np.unique(key, return_index=True, return_inverse=True, return_counts=True)
+        else:
+            # Too few balls for grouping them to pay off, so each is its own kind, in sweep order
+            sample = order
+            kind = np.empty(count, np.intp)
+            kind[order] = np.arange(count)
+            sizes = np.ones(count, np.intp)
+        kind_x = x[sample]
+        kind_y = y[sample]
+        first, second = self.broadphase.ball_pairs(kind_x, kind_y, kind_x + balls.width, kind_y + balls.height,
+                                                   np.arange(len(sample)))
+        if not len(first):
+            return
+
+        # Equal masses exchange velocity along the axis of least penetration. Every ball has the same
+        # size, so a pair's overlap on each axis is that size less the gap between their corners
+        gap_x = kind_x[second] - kind_x[first]
+        gap_y = kind_y[second] - kind_y[first]
+        along_x = balls.width - np.abs(gap_x) < balls.height - np.abs(gap_y)
+        kind_speed_x = speed_x[sample]
+        kind_speed_y = speed_y[sample]
+        closing_x = (kind_speed_x[second] - kind_speed_x[first]) * gap_x < 0
+        closing_y = (kind_speed_y[second] - kind_speed_y[first]) * gap_y < 0
+        bounce = np.flatnonzero(np.where(along_x, closing_x, closing_y))
+        if not len(bounce):
+            return
+        first = first[bounce]
+        second = second[bounce]
+
+        # Every ball of one kind against every ball of the other, in the order a sweep over the balls meets them
+        by_kind = np.argsort(kind, kind='stable')
+        starts = np.cumsum(sizes) - sizes
+        owners, cells = expand_ranges(np.zeros(len(bounce), np.intp), sizes[first] * sizes[second])
+        span = sizes[second][owners]
+        i = by_kind[starts[first][owners] + cells // span]
+        j = by_kind[starts[second][owners] + cells % span]
+        rank = np.empty(count, np.intp)
+        rank[order] = np.arange(count)
+        sweep = np.argsort(np.minimum(rank[i], rank[j]) * count + np.maximum(rank[i], rank[j]), kind='stable')
+        i = i[sweep]
+        j = j[sweep]
+        along_x = along_x[bounce][owners][sweep]
+
+        # A ball exchanges with its first bouncing partner in sweep order only, so the exchanges
+        # touch distinct balls and can all be made at once
+        pair = np.arange(len(i))
+        earliest = np.full(count, len(i))
+        np.minimum.at(earliest, np.concatenate((i, j)), np.concatenate((pair, pair)))
+        exchange = (earliest[i] == pair) & (earliest[j] == pair)
+        for speed, axis in ((speed_x, along_x), (speed_y, ~along_x)):
+            chosen = exchange & axis
+            first = i[chosen]
+            second = j[chosen]
+            speed[first], speed[second] = speed[second], speed[first]
+
+    def split_balls(self):
+        """Apply pending multi-ball power-ups"""
+        balls = self.balls
+        ball = self.worker
+        for _ in range(self.multiball_pending):
+            for i in range(len(balls)):
+                balls.load(i, ball)
+                for _ in range(self.multiball_count):
+                    if len(balls) >= self.max_balls:
+                        break
+                    balls.append(ball.split(self.rng))
+        self.multiball_pending = 0
@@ -0,0 +1,55 @@
+"""Game fonts, with system font lookups cached on disk.
+
+``pygame.font.SysFont`` builds its table of installed fonts the first time
+it is called, which on Linux means running ``fc-list`` and parsing every
+font on the system, and it does so on every start even when the font is
+missing and pygame's default font is used. The resolved path is cached in
+a small JSON file instead, so later starts open the font file directly.
+Delete the file to look fonts up again after installing new ones.
+"""
+import json
+import os
+
+import pygame
+
+
+def default_cache_path():
+    """Font cache location, overridable with BREAKOUT_FONT_CACHE"""
+    path = os.environ.get('BREAKOUT_FONT_CACHE')
+    if path:
+        return path
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'breakout', 'fonts.json')
+
+
+def read_cache(path):
+    """Cached font paths, or an empty dict when the cache is missing or unreadable"""
+    try:
+        with open(path) as handle:
+            cache = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def write_cache(path, cache):
+    """Save the cache, ignoring failures since it is only a speed-up"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as handle:
+            json.dump(cache, handle, indent=1)
+    except OSError:
+        pass
+
+
+def font_path(name, cache_path=None):
+    """File of the system font name, or None when pygame's default font stands in for it"""
+    cache_path = cache_path or default_cache_path()
+    cache = read_cache(cache_path)
+    if name in cache and (cache[name] is None or os.path.exists(cache[name])):
+        return cache[name]
+
+    cache[name] = pygame.font.match_font(name)
+    write_cache(cache_path, cache)
+    return cache[name]
+
@@ -0,0 +1,103 @@
+"""Binary level files holding a wall's block strengths.
+
+A level file is a fixed header followed by one strength byte per block in
+row-major order, so it can be memory-mapped and handed to the wall without
+creating any per-block objects:
+
+    python -m breakout.levels generate huge.lvl --cols 300 --rows 150 --block-width 2 --block-height 2 --seed 3
+    python Break_Out_game.py --level huge.lvl
+
+On the 600x600 board that gives 2x2 pixel blocks filling the top half.
+Levels whose blocks would shrink under a pixel are rejected with LevelError.
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from collections import namedtuple
+
+import numpy as np
+
+from .engine import LevelError, default_layout
+
+
+MAGIC = b'BRKL'
+VERSION = 1
+
+# magic, version, cols, rows, block width, block height, padded to 32 bytes
+HEADER = struct.Struct('<4sBxxxIIHH12x')
+
+Level = namedtuple('Level', ['cols', 'rows', 'block_width', 'block_height', 'strength'])
+
+
+def generate_layout(cols, rows, seed=None, fill=0.85):
+    """Random layout where stronger blocks become likelier towards the top"""
+    rng = np.random.default_rng(seed)
+    depth = np.linspace(1.0, 0.0, rows, dtype=np.float32)[:, None]
+    roll = rng.random((rows, cols), dtype=np.float32)
+    strength = 1 + (roll < depth * 0.8).astype(np.uint8) + (roll < depth * 0.4).astype(np.uint8)
+    strength[rng.random((rows, cols), dtype=np.float32) >= fill] = 0
+    return strength.tobytes()
+
+
+def save_level(path, cols, rows, block_width, block_height, strength):
+    """Write a level file from a buffer of rows * cols strength bytes"""
+    if not (cols and rows and block_width and block_height):
+        raise LevelError(f'level has a zero size: {cols}x{rows} blocks of {block_width}x{block_height} px')
+    strength = memoryview(strength).cast('B')
+    if len(strength) != cols * rows:
+        raise LevelError(f'expected {cols * rows} strength bytes, got {len(strength)}')
+    with open(path, 'wb') as handle:
+        handle.write(HEADER.pack(MAGIC, VERSION, cols, rows, block_width, block_height))
+        handle.write(strength)
+
+
+def load_level(path):
+    """Memory-map a level file; the strengths are a read-only view of the file.
+
+    Raises LevelError for a file that cannot be opened or is not a valid level.
+    """
+    try:
+        with open(path, 'rb') as handle:
+            # mmap refuses empty files, so short ones are caught before mapping
+            if os.fstat(handle.fileno()).st_size < HEADER.size:
+                raise LevelError('level file is truncated')
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except OSError as error:
+        raise LevelError(f'cannot read level file: {error.strerror}') from None
+    magic, version, cols, rows, block_width, block_height = HEADER.unpack_from(mapped)
+    if magic != MAGIC:
+        raise LevelError('not a level file')
+    if version != VERSION:
+        raise LevelError(f'unsupported level version {version}')
+    if not (cols and rows and block_width and block_height):
+        raise LevelError(f'level has a zero size: {cols}x{rows} blocks of {block_width}x{block_height} px')
+    if len(mapped) != HEADER.size + cols * rows:
+        raise LevelError('level size does not match its header')
+    strength = memoryview(mapped)[HEADER.size:]
+    return Level(cols, rows, block_width, block_height, strength)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Create Breakout level files')
+    parser.add_argument('command', choices=['generate', 'default'])
+    parser.add_argument('path')
+    parser.add_argument('--cols', type=int, default=6)
+    parser.add_argument('--rows', type=int, default=6)
+    parser.add_argument('--block-width', type=int, default=100)
+    parser.add_argument('--block-height', type=int, default=50)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        strength = generate_layout(args.cols, args.rows, args.seed)
+    else:
+        strength = default_layout(args.cols, args.rows)
+    save_level(args.path, args.cols, args.rows, args.block_width, args.block_height, strength)
+    print(f'Wrote {args.cols}x{args.rows} level to {args.path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
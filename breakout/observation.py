@@ -0,0 +1,193 @@
+"""Screen observations for agents, read straight from the rendered pixels.
+
+``screen_pixels`` exposes a surface as a NumPy view without copying it.
+``ObservationPipeline`` turns each rendered frame into an agent observation
+with optional downsampling, grayscale and frame stacking, all written into
+buffers allocated once, and ``PixelGame`` steps an engine with frame skip
+and renders it off-screen, so no window or display driver is needed.
+"""
+import sys
+
+import numpy as np
+import pygame
+
+from .engine import BreakoutEngine
+from .quality import QUALITY_LEVELS
+from .render import Renderer
+from .settings import screen_width, screen_height
+from .snapshot import restore, snapshot
+
+
+# Luma weights of red, green and blue in 1/256ths (ITU-R BT.601)
+LUMA_WEIGHTS = (77, 150, 29)
+
+
+def screen_pixels(surface):
+    """(height, width, 3) RGB view of a surface's pixels, sharing its memory.
+
+    The surface stays locked while the view is alive and pygame refuses to
+    blit onto a locked surface, so drop the view before drawing again.
+    """
+    return pygame.surfarray.pixels3d(surface).transpose(1, 0, 2)
+
+
+def channel_bytes(surface):
+    """Byte offsets of red, green and blue within one of the surface's 32-bit pixels"""
+    shifts = surface.get_shifts()[:3]
+    masks = surface.get_masks()[:3]
+    if surface.get_bytesize() != 4 or any(mask != 0xff << shift for mask, shift in zip(masks, shifts)):
+        raise ValueError('observations need a 32-bit surface with one byte per channel')
+    offsets = [shift // 8 for shift in shifts]
+    if sys.byteorder == 'big':
+        offsets = [3 - offset for offset in offsets]
+    return offsets
+
+
+class ObservationPipeline:
+    """Downsampled, optionally grayscale and stacked observations of a surface.
+
+    ``observe`` copies every ``downsample``-th pixel of every
+    ``downsample``-th row out of the surface, which is the only pass over the
+    full frame, then reduces it to luma when ``grayscale`` is set. The last
+    ``stack`` frames are kept twice over in one buffer, each frame written
+    to slot i and i + stack, so the stack in age order is always the
+    contiguous slice ending at the newest frame and returning it copies
+    nothing. RGB frames stay packed 32-bit pixels and are returned as a
+    byte view of them.
+
+    Observations are ``(stack, height, width)`` uint8 arrays, with a trailing
+    RGB axis unless grayscale. They are views into the pipeline's buffers
+    and change on the next ``observe``; copy them to keep them.
+    """
+    def __init__(self, surface, grayscale=False, downsample=1, stack=1):
+        self.surface = surface
+        self.grayscale = grayscale
+        self.downsample = downsample
+        self.stack = stack
+        red, green, blue = channel_bytes(surface)
+        width, height = surface.get_size()
+        self.width = -(-width // downsample)
+        self.height = -(-height // downsample)
+        shape = (2 * stack, self.height, self.width)
+        self.position = 0
+        self.filled = False
+
+        if grayscale:
+            self.packed = np.empty((self.height, self.width), dtype=np.uint32)
+            channels = self.packed.view(np.uint8).reshape(self.height, self.width, 4)
+            self.channels = [channels[..., offset] for offset in (red, green, blue)]
+            self.luma = np.empty((self.height, self.width), dtype=np.uint16)
+            self.term = np.empty((self.height, self.width), dtype=np.uint16)
+            self.frames = np.empty(shape, dtype=np.uint8)
+            self.output = self.frames
+        else:
+            # Packed pixels, seen as RGB through a byte view with the channels in order
+            self.frames = np.empty(shape, dtype=np.uint32)
+            step = green - red
+            if step not in (1, -1) or blue - green != step:
+                raise ValueError('observations need the red, green and blue bytes next to each other')
+            end = red + 3 * step
+            self.output = self.frames.view(np.uint8).reshape(shape + (4,))[..., red:end if end >= 0 else None:step]
+
+    @property
+    def shape(self):
+        """Shape of each observation"""
+        return (self.stack,) + self.output.shape[1:]
+
+    def reset(self):
+        """Start a new episode: the next observation fills the whole stack with its frame"""
+        self.filled = False
+
+    def capture(self, target):
+        """Copy the downsampled surface pixels into target"""
+        pixels = pygame.surfarray.pixels2d(self.surface)
+        np.copyto(target, pixels.T[::self.downsample, ::self.downsample])
+        del pixels
+
+    def to_luma(self, target):
+        """Luma of the captured pixels, in place through the 16-bit scratch buffers"""
+        luma, term = self.luma, self.term
+        (red, green, blue), (red_weight, green_weight, blue_weight) = self.channels, LUMA_WEIGHTS
+        np.multiply(red, red_weight, out=luma, dtype=np.uint16)
+        np.multiply(green, green_weight, out=term, dtype=np.uint16)
+        np.add(luma, term, out=luma)
+        np.multiply(blue, blue_weight, out=term, dtype=np.uint16)
+        np.add(luma, term, out=luma)
+        np.right_shift(luma, 8, out=luma)
+        np.copyto(target, luma, casting='unsafe')
+
+    def observe(self):
+        """Observation of the surface as it is now, pushed onto the frame stack"""
+        position = self.position
+        newest = self.frames[position]
+        if self.grayscale:
+            self.capture(self.packed)
+            self.to_luma(newest)
+        else:
+            self.capture(newest)
+
+        if self.filled:
+            self.frames[position + self.stack] = newest
+        else:
+            self.frames[:] = newest
+            self.filled = True
+        self.position = (position + 1) % self.stack
+        return self.output[position + 1:position + 1 + self.stack]
+
+
+class PixelGame:
+    """A BreakoutEngine played from its rendered screen, for agents.
+
+    ``step`` holds the paddle target for ``frame_skip`` ticks, stopping
+    early if the game ends, then renders only the last one and returns the
+    observation, the score gained and whether the game is over. The scene
+    is drawn off-screen into ``surface``, a fresh 32-bit one by default, so
+    only ``pygame.font`` has to be initialized.
+
+    ``reset`` puts the engine back into its starting state from a snapshot,
+    starts the renderer's effects afresh from ``seed`` and launches the
+    ball. The pulsing effects follow the engine's clock rather than the
+    wall clock. With a seed, the same actions therefore give the same
+    observations in every episode.
+    """
+    def __init__(self, frame_skip=4, grayscale=True, downsample=4, stack=4, surface=None,
+                 quality=QUALITY_LEVELS[-1], seed=None, **config):
+        if surface is None:
+            surface = pygame.Surface((screen_width, screen_height), 0, 32)
+        self.surface = surface
+        self.frame_skip = frame_skip
+        self.seed = seed
+        self.engine = BreakoutEngine(seed=seed, **config)
+        self.start = snapshot(self.engine)
+        self.renderer = Renderer(surface, seed=seed, quality=quality, clock=lambda: self.engine.time_ms)
+        self.pipeline = ObservationPipeline(surface, grayscale, downsample, stack)
+
+    @property
+    def pixels(self):
+        """The rendered frame as a zero-copy view, see screen_pixels"""
+        return screen_pixels(self.surface)
+
+    def observe(self):
+        """Render the engine and push the frame onto the observation stack"""
+        self.renderer.draw_scene(self.engine)
+        return self.pipeline.observe()
+
+    def reset(self):
+        """Start a new game and return its first observation"""
+        restore(self.engine, self.start)
+        self.engine.launch()
+        self.renderer.reset_effects(self.seed)
+        self.pipeline.reset()
+        return self.observe()
+
+    def step(self, paddle_x):
+        """Play frame_skip ticks and return (observation, score gained, game over)"""
+        engine = self.engine
+        score = engine.score
+        game_over = 0
+        for _ in range(self.frame_skip):
+            game_over = engine.step(paddle_x)
+            self.renderer.handle_events(engine)
+            if game_over:
+                break
+        return self.observe(), engine.score - score, game_over != 0
@@ -0,0 +1,82 @@
+"""Precomputed color shades and sine tables for the pulsing effects.
+
+Every pulse in the game brightens a base color by ``bias + amplitude *
+sin(rate * ticks + phase)``. ``Pulse`` tabulates that offset, and the
+resulting color, over one period of ``SINE_STEPS`` phases, so a frame looks
+effects up by phase index instead of calling ``math.sin`` and building a
+clamped color tuple.
+"""
+import math
+
+from .settings import bg, block_red, block_green, block_blue, paddle_col, text_col
+
+
+# Resolution of the sine tables; a power of two so indices wrap with a mask
+SINE_STEPS = 4096
+SINE_MASK = SINE_STEPS - 1
+STEPS_PER_RADIAN = SINE_STEPS / (2 * math.pi)
+
+# One period of sin, sampled SINE_STEPS times
+SINE = [math.sin(i / STEPS_PER_RADIAN) for i in range(SINE_STEPS)]
+
+
+def shade(color, amount):
+    """Color with amount added to each channel, clamped to 0-255"""
+    return tuple(max(0, min(255, c + amount)) for c in color)
+
+
+def phase_steps(radians):
+    """Table index offset for a phase angle"""
+    return int(radians * STEPS_PER_RADIAN)
+
+
+class Palette:
+    """Shades of base colors for every offset in [low, high], shared as tuples"""
+    def __init__(self, colors, low, high):
+        self.low = low
+        self.high = high
+        self.shades = {color: [shade(color, amount) for amount in range(low, high + 1)] for color in colors}
+
+    def shade(self, color, amount):
+        """Precomputed shade(color, amount)"""
+        return self.shades[color][amount - self.low]
+
+
+class Pulse:
+    """A sinusoidal brightness offset tabulated over one period.
+
+    ``values[i]`` is ``int(bias + amplitude * sin)`` at phase index i and,
+    when a base color is given, ``colors[i]`` is that color shaded by it.
+    ``index`` turns a tick count and optional phase into a table index.
+    """
+    def __init__(self, amplitude, rate, bias=0, color=None):
+        self.rate_steps = rate * STEPS_PER_RADIAN
+        self.values = [int(bias + amplitude * s) for s in SINE]
+        self.colors = None
+        if color is not None:
+            palette = Palette([color], min(self.values), max(self.values))
+            self.colors = [palette.shade(color, value) for value in self.values]
+
+    def index(self, ticks, phase=0):
+        """Table index at ticks with a phase offset given in table steps"""
+        return (int(ticks * self.rate_steps) + phase) & SINE_MASK
+
+    def value(self, ticks, phase=0):
+        """Brightness offset at ticks"""
+        return self.values[self.index(ticks, phase)]
+
+    def color(self, ticks, phase=0):
+        """Shaded color at ticks"""
+        return self.colors[self.index(ticks, phase)]
+
+
+# Pulses used by the renderer
+star_pulse = Pulse(20, 0.01, bias=30, color=bg)
+block_pulse = Pulse(10, 0.005)
+menu_pulse = Pulse(20, 0.01, color=text_col)
+
+# Block fills over every wall pulse phase, plus their fixed inner highlight
+block_palette = Palette([block_red, block_green, block_blue], -10, 30)
+
+# Trail shade and every paddle glow intensity
+paddle_palette = Palette([paddle_col], 0, 50)
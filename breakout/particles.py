@@ -0,0 +1,118 @@
+"""Fixed-capacity particle pool stored as parallel NumPy arrays"""
+import numpy as np
+import pygame
+
+
+class ParticlePool:
+    """Visual effect particles for block destruction and collisions.
+
+    Live particles occupy the first ``count`` slots of each array in spawn
+    order, so the oldest particle is always at index 0. Updating moves every
+    particle in one vectorized step and compacts dead slots in place; when a
+    burst would exceed ``capacity`` the oldest particles are evicted first.
+    """
+    max_life = 30
+
+    def __init__(self, capacity=2000, rng=None):
+        self.capacity = capacity
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.count = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.int16)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.uint8)
+        self.colors = []
+        self._color_index = {}
+
+    def __len__(self):
+        return self.count
+
+    def _arrays(self):
+        return (self.x, self.y, self.vx, self.vy, self.life, self.size, self.color)
+
+    def color_index(self, color):
+        """Palette slot for color, registering it on first use"""
+        index = self._color_index.get(color)
+        if index is None:
+            index = len(self.colors)
+            self.colors.append(color)
+            self._color_index[color] = index
+        return index
+
+    def spawn(self, x, y, color, count=10):
+        """Generate particle burst at specified location"""
+        count = min(count, self.capacity)
+        if count <= 0:
+            return
+
+        # Evict the oldest particles to make room
+        overflow = self.count + count - self.capacity
+        if overflow > 0:
+            keep = self.count - overflow
+            for array in self._arrays():
+                array[:keep] = array[overflow:self.count]
+            self.count = keep
+
+        start = self.count
+        end = start + count
+        self.x[start:end] = x
+        self.y[start:end] = y
+        self.vx[start:end] = self.rng.uniform(-3, 3, count)
+        self.vy[start:end] = self.rng.uniform(-3, -1, count)
+        self.life[start:end] = self.max_life
+        self.size[start:end] = self.rng.uniform(2, 4, count)
+        self.color[start:end] = self.color_index(color)
+        self.count = end
+
+    def update(self):
+        """Update all particles and remove expired ones"""
+        n = self.count
+        if n == 0:
+            return
+        self.x[:n] += self.vx[:n]
+        self.y[:n] += self.vy[:n]
+        self.vy[:n] += 0.1
+        self.life[:n] -= 1
+
+        # Compact live particles to the front, preserving spawn order
+        alive = self.life[:n] > 0
+        live_count = int(np.count_nonzero(alive))
+        if live_count != n:
+            for array in self._arrays():
+                array[:live_count] = array[:n][alive]
+            self.count = live_count
+
+    def clear(self):
+        """Remove every particle"""
+        self.count = 0
+
+    def draw(self, surface):
+        """Render all active particles with a fading size.
+
+        Returns the bounding rect of the drawn particles, or None.
+        """
+        n = self.count
+        if n == 0:
+            return None
+        sizes = (self.size[:n] * self.life[:n] / self.max_life).astype(np.int32)
+        visible = np.flatnonzero(sizes > 0)
+        if len(visible) == 0:
+            return None
+        colors = self.colors
+        draw_circle = pygame.draw.circle
+        for x, y, size, color in zip(self.x[visible].astype(np.int32).tolist(),
+                                     self.y[visible].astype(np.int32).tolist(),
+                                     sizes[visible].tolist(),
+                                     self.color[visible].tolist()):
+            draw_circle(surface, colors[color], (x, y), size)
+
+        # Bounding box of every visible particle
+        xs = self.x[visible]
+        ys = self.y[visible]
+        radius = int(sizes[visible].max()) + 1
+        left = int(xs.min()) - radius
+        top = int(ys.min()) - radius
+        return pygame.Rect(left, top, int(xs.max()) + radius - left + 1, int(ys.max()) + radius - top + 1)
@@ -0,0 +1,67 @@
+"""Continuous collision detection and fixed-timestep helpers"""
+import math
+
+
+def sweep_aabb(ax, ay, aw, ah, dx, dy, bx, by, bw, bh):
+    """Time of impact of box a moving by (dx, dy) against static box b.
+
+    Returns ``(t, hit_x, hit_y)`` where ``t`` is the fraction of the move at
+    which the boxes first touch and ``hit_x``/``hit_y`` tell which axes the
+    contact happened on (both for an exact corner hit), or None when they do
+    not meet during the move. Boxes that already overlap are not reported.
+    """
+    if dx > 0:
+        entry_x = (bx - (ax + aw)) / dx
+        exit_x = ((bx + bw) - ax) / dx
+    elif dx < 0:
+        entry_x = ((bx + bw) - ax) / dx
+        exit_x = (bx - (ax + aw)) / dx
+    elif ax + aw <= bx or ax >= bx + bw:
+        return None
+    else:
+        entry_x = -math.inf
+        exit_x = math.inf
+
+    if dy > 0:
+        entry_y = (by - (ay + ah)) / dy
+        exit_y = ((by + bh) - ay) / dy
+    elif dy < 0:
+        entry_y = ((by + bh) - ay) / dy
+        exit_y = (by - (ay + ah)) / dy
+    elif ay + ah <= by or ay >= by + bh:
+        return None
+    else:
+        entry_y = -math.inf
+        exit_y = math.inf
+
+    entry = max(entry_x, entry_y)
+    if entry < 0 or entry > 1 or entry >= min(exit_x, exit_y):
+        return None
+    return entry, entry_x >= entry_y, entry_y >= entry_x
+
+
+class FixedTimestep:
+    """Accumulator that runs the simulation at a fixed rate.
+
+    Each frame feeds in the real elapsed time and gets back how many fixed
+    steps to simulate. ``alpha`` is how far the frame sits between the last
+    two simulated states, for render interpolation. At most ``max_steps`` are
+    run per frame so a long stall does not trigger a spiral of catch-up work.
+    """
+    def __init__(self, step_hz, max_steps=5):
+        self.step_time = 1.0 / step_hz
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.alpha = 0.0
+
+    def advance(self, elapsed):
+        """Add elapsed seconds and return the number of steps to run"""
+        self.accumulator += elapsed
+        steps = int(self.accumulator / self.step_time)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step_time
+        self.alpha = self.accumulator / self.step_time
+        return steps
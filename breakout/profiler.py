@@ -0,0 +1,163 @@
+"""Frame profiler with an in-game overlay and Chrome trace export"""
+import json
+import time
+
+import numpy as np
+import pygame
+
+
+# Main loop stages in the order they run each frame
+STAGES = ('wait', 'simulate', 'background', 'particles', 'wall', 'paddle', 'ball', 'ui',
+          'screens', 'events', 'present')
+
+
+def _noop(*args):
+    """Stand-in for recording calls while the profiler is disabled"""
+
+
+class FrameProfiler:
+    """Per-frame stage timings recorded into a fixed-size ring buffer.
+
+    The main loop calls ``begin_frame``, then ``lap(stage)`` as each stage
+    finishes, then ``end_frame``. Laps are contiguous, so every stage's
+    duration is the time since the previous lap. While disabled the three
+    methods are replaced by a do-nothing function on the instance, so a
+    production build pays one empty call per lap.
+    """
+    def __init__(self, fps, capacity=600, stages=STAGES, enabled=False):
+        self.fps = fps
+        self.budget_ms = 1000.0 / fps
+        self.capacity = capacity
+        self.stages = stages
+        self.stage_index = {name: i for i, name in enumerate(stages)}
+        self.stage_ms = np.zeros((capacity, len(stages)), dtype=np.float32)
+        self.frame_ms = np.zeros(capacity, dtype=np.float32)
+        self.frame_start = np.zeros(capacity, dtype=np.int64)
+        self.particles = np.zeros(capacity, dtype=np.int32)
+        self.quality = np.zeros(capacity, dtype=np.int8)
+        self.frames = 0
+        self.current = [0.0] * len(stages)
+        self.frame_begin = 0
+        self.last = 0
+        self.enabled = False
+        if enabled:
+            self.enable()
+        else:
+            self.disable()
+
+    def enable(self):
+        """Start recording from the next frame"""
+        self.enabled = True
+        self.begin_frame = self._begin_frame
+
+    def disable(self):
+        """Stop recording; the recording methods become no-ops"""
+        self.enabled = False
+        self.begin_frame = _noop
+        self.lap = _noop
+        self.end_frame = _noop
+
+    def _begin_frame(self):
+        # Laps only start recording once a whole frame can be measured
+        self.lap = self._lap
+        self.end_frame = self._end_frame
+        now = time.perf_counter_ns()
+        self.frame_begin = now
+        self.last = now
+        self.current = [0.0] * len(self.stages)
+
+    def _lap(self, stage):
+        now = time.perf_counter_ns()
+        self.current[self.stage_index[stage]] += (now - self.last) / 1e6
+        self.last = now
+
+    def _end_frame(self, particles=0, quality=0):
+        slot = self.frames % self.capacity
+        self.stage_ms[slot] = self.current
+        self.frame_ms[slot] = (self.last - self.frame_begin) / 1e6
+        self.frame_start[slot] = self.frame_begin
+        self.particles[slot] = particles
+        self.quality[slot] = quality
+        self.frames += 1
+
+    def recent(self, count=None):
+        """Ring buffer slots of the most recent frames, oldest first"""
+        available = min(self.frames, self.capacity)
+        count = available if count is None else min(count, available)
+        return (np.arange(self.frames - count, self.frames) % self.capacity)
+
+    def summary(self, count=60):
+        """Average stage times, frame time and dropped frames over recent frames"""
+        slots = self.recent(count)
+        if len(slots) == 0:
+            return {'frames': 0}
+        frame_ms = self.frame_ms[slots]
+        return {
+            'frames': len(slots),
+            'frame_ms': float(frame_ms.mean()),
+            'max_frame_ms': float(frame_ms.max()),
+            'dropped': int(np.count_nonzero(frame_ms > self.budget_ms * 1.5)),
+            'particles': int(self.particles[slots[-1]]),
+            'quality': int(self.quality[slots[-1]]),
+            'stages': {name: float(self.stage_ms[slots, i].mean()) for i, name in enumerate(self.stages)},
+        }
+
+    def trace_events(self):
+        """Recorded frames as Chrome trace events"""
+        events = []
+        for slot in self.recent():
+            start_us = int(self.frame_start[slot]) / 1000.0
+            events.append({'name': 'frame', 'ph': 'X', 'pid': 1, 'tid': 1, 'ts': start_us,
+                           'dur': float(self.frame_ms[slot]) * 1000.0,
+                           'args': {'particles': int(self.particles[slot])}})
+            offset = start_us
+            for i, name in enumerate(self.stages):
+                duration = float(self.stage_ms[slot, i]) * 1000.0
+                if duration > 0:
+                    events.append({'name': name, 'ph': 'X', 'pid': 1, 'tid': 2, 'ts': offset, 'dur': duration})
+                offset += duration
+            events.append({'name': 'particles', 'ph': 'C', 'pid': 1, 'ts': start_us,
+                           'args': {'count': int(self.particles[slot])}})
+            events.append({'name': 'quality', 'ph': 'C', 'pid': 1, 'ts': start_us,
+                           'args': {'level': int(self.quality[slot])}})
+        return events
+
+    def export_trace(self, path):
+        """Write the recorded frames as a Chrome trace-event JSON file"""
+        trace = {
+            'traceEvents': self.trace_events(),
+            'displayTimeUnit': 'ms',
+            'otherData': {'fps': self.fps, 'frames': int(min(self.frames, self.capacity))},
+        }
+        with open(path, 'w') as handle:
+            json.dump(trace, handle)
+        return path
+
+    def draw_overlay(self, surface, font, history=120):
+        """Render a frame time graph and per-stage timings in the top-left corner"""
+        summary = self.summary()
+        panel = pygame.Rect(5, 60, 230, 120 + 14 * len(self.stages))
+        overlay = pygame.Surface(panel.size, pygame.SRCALPHA)
+        overlay.fill((0, 0, 0, 170))
+
+        # Frame time graph against the frame budget
+        graph = pygame.Rect(5, 5, panel.width - 10, 50)
+        scale = graph.height / (self.budget_ms * 2)
+        budget_y = graph.bottom - int(self.budget_ms * scale)
+        pygame.draw.line(overlay, (255, 80, 80), (graph.left, budget_y), (graph.right, budget_y))
+        slots = self.recent(history)
+        if len(slots) > 1:
+            step = graph.width / (history - 1)
+            points = [(graph.left + int(i * step), graph.bottom - int(min(self.frame_ms[slot] * scale, graph.height)))
+                      for i, slot in enumerate(slots)]
+            pygame.draw.lines(overlay, (120, 255, 120), False, points)
+
+        lines = [f'frame {summary.get("frame_ms", 0):.2f} ms  max {summary.get("max_frame_ms", 0):.1f}',
+                 f'dropped {summary.get("dropped", 0)}/{summary["frames"]} at {self.fps} fps',
+                 f'particles {summary.get("particles", 0)}  quality {summary.get("quality", 0)}']
+        lines += [f'{name:<10} {ms:6.2f} ms' for name, ms in summary.get('stages', {}).items()]
+        y = graph.bottom + 6
+        for line in lines:
+            overlay.blit(font.render(line, True, (255, 255, 255)), (8, y))
+            y += 14
+        return surface.blit(overlay, panel.topleft)
@@ -0,0 +1,83 @@
+"""Adaptive effect quality driven by the frame time budget"""
+from collections import deque, namedtuple
+
+from .settings import trail_length
+
+
+# Effect settings of one quality level: particle burst scale, ball trail points drawn, text glow
+# margin in pixels (0 draws plain text) and the fraction of background stars drawn
+QualityLevel = namedtuple('QualityLevel', ['name', 'particles', 'trail', 'glow', 'stars'])
+
+# Lowest to highest
+QUALITY_LEVELS = (
+    QualityLevel('minimal', 0.25, 2, 0, 0.25),
+    QualityLevel('low', 0.5, 4, 1, 0.5),
+    QualityLevel('medium', 0.75, 6, 2, 0.75),
+    QualityLevel('high', 1.0, trail_length, 2, 1.0),
+)
+
+
+class QualityController:
+    """Picks a quality level from recent frame times, with hysteresis.
+
+    ``update`` is fed the milliseconds each frame spent working, with the
+    wait for the next frame left out. When the mean of the last ``window``
+    frames goes over ``lower_at`` of the frame budget the level steps down.
+    It only steps back up once that mean has stayed under ``raise_at`` of
+    the budget for ``raise_after`` frames. Every change clears the recent
+    frame times, so each level is judged on its own frames. The gap between
+    the two thresholds and the longer wait to step up keep a frame rate near
+    the budget from flipping between levels. The levels are lowest first.
+    """
+    def __init__(self, fps, levels=QUALITY_LEVELS, level=None, window=30, lower_at=0.9, raise_at=0.5,
+                 raise_after=120):
+        self.budget_ms = 1000.0 / fps
+        self.levels = levels
+        self.level = len(levels) - 1 if level is None else level
+        self.window = window
+        self.lower_ms = lower_at * self.budget_ms
+        self.raise_ms = raise_at * self.budget_ms
+        self.raise_after = raise_after
+        self.frame_ms = deque(maxlen=window)
+        self.total_ms = 0.0
+        self.calm_frames = 0
+        self.changes = 0
+
+    @property
+    def settings(self):
+        """QualityLevel in use"""
+        return self.levels[self.level]
+
+    @property
+    def name(self):
+        """Name of the quality level in use"""
+        return self.levels[self.level].name
+
+    def set_level(self, level):
+        """Switch to a level and start measuring afresh"""
+        level = max(0, min(len(self.levels) - 1, level))
+        if level != self.level:
+            self.level = level
+            self.changes += 1
+        self.frame_ms.clear()
+        self.total_ms = 0.0
+        self.calm_frames = 0
+
+    def update(self, frame_ms):
+        """Record a frame's work time and return True when the quality level changed"""
+        if len(self.frame_ms) == self.window:
+            self.total_ms -= self.frame_ms[0]
+        self.frame_ms.append(frame_ms)
+        self.total_ms += frame_ms
+        if len(self.frame_ms) < self.window:
+            return False
+
+        mean_ms = self.total_ms / self.window
+        if mean_ms > self.lower_ms and self.level > 0:
+            self.set_level(self.level - 1)
+            return True
+        self.calm_frames = self.calm_frames + 1 if mean_ms < self.raise_ms else 0
+        if self.calm_frames >= self.raise_after and self.level < len(self.levels) - 1:
+            self.set_level(self.level + 1)
+            return True
+        return False
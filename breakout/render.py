@@ -0,0 +1,317 @@
+"""Pygame renderer that draws a BreakoutEngine's state"""
+from itertools import chain, repeat
+
+import numpy as np
+import pygame
+
+from .engine import EVENT_BLOCK_HIT, EVENT_PADDLE_HIT
+from .dirty_rects import DirtyRects
+from .fonts import font_path
+from .palette import menu_pulse
+from .particles import ParticlePool
+from .profiler import FrameProfiler
+from .quality import QUALITY_LEVELS
+from .text_cache import TextCache
+from .sprites import SpriteAtlas, heart_size, max_paddle_glow
+from .starfield import Starfield
+from .wall_cache import WallRenderer
+from .settings import (screen_width, cols, bg, block_red, block_green, block_blue,
+                       text_col, max_particles, fps, star_count, star_layers)
+
+
+def block_color(strength):
+    """Base color for a block of the given strength"""
+    if strength == 3:
+        return block_blue
+    elif strength == 2:
+        return block_green
+    return block_red
+
+
+def combo_alpha(engine):
+    """Opacity of the combo display, fading out after the last block hit"""
+    return max(0, 255 - (engine.time_ms - engine.last_hit_time) // 10)
+
+
+def load_fonts():
+    """Create the small, regular and large game fonts"""
+    path = font_path('Constantia')
+    return tuple(pygame.font.Font(path, size) for size in (20, 30, 40))
+
+
+class Renderer:
+    """Draws the scene for a BreakoutEngine and owns all purely visual state.
+
+    Each draw method returns the screen rects it touched. With
+    ``dirty_rects=True`` those rects are collected and ``present`` only pushes
+    the changed regions to the display. ``set_quality`` scales the effects
+    down or back up to a ``QualityLevel``.
+
+    The star, wall and menu pulses follow ``clock``, which returns
+    milliseconds and defaults to ``pygame.time.get_ticks``. A clock reading
+    the engine's ``time_ms`` makes frames depend only on the game.
+    """
+    def __init__(self, surface, dirty_rects=False, seed=None, profiler=None, stars=star_count,
+                 quality=QUALITY_LEVELS[-1], clock=None):
+        self.surface = surface
+        self.width, self.height = surface.get_size()
+        self.small_font, self.font, self.large_font = load_fonts()
+        self.stars = stars
+        self.clock = clock if clock is not None else pygame.time.get_ticks
+        self.quality = None
+        self.reset_effects(seed)
+        self.text_cache = TextCache()
+        self.wall_cache = WallRenderer(block_color)
+        self.sprite_atlas = SpriteAtlas(surface, paddle_size=(screen_width // cols, 20))
+        self.dirty = DirtyRects(surface.get_rect()) if dirty_rects else None
+        self.profiler = profiler if profiler is not None else FrameProfiler(fps)
+        self.idle_backdrop = None
+        self.idle_rects = []
+        self.pending_update = None
+        self.set_quality(quality)
+
+    def reset_effects(self, seed=None):
+        """Start the particles, starfield and paddle glow afresh, as a new renderer with seed would"""
+        self.paddle_glow = 0
+        self.rng = np.random.default_rng(seed)
+        self.particles = ParticlePool(max_particles, self.rng)
+        self.starfield = Starfield(self.surface, self.stars, star_layers, self.rng)
+        if self.quality is not None:
+            self.starfield.set_density(self.quality.stars)
+
+    def set_quality(self, quality):
+        """Scale particle bursts, trails, text glow and star density to a QualityLevel"""
+        if quality == self.quality:
+            return
+        self.quality = quality
+        self.text_cache.set_glow_margin(quality.glow)
+        self.starfield.set_density(quality.stars)
+        # The idle screen copy holds text drawn with the old glow
+        self.idle_backdrop = None
+        if self.dirty is not None:
+            self.dirty.invalidate()
+
+    def create_particles(self, x, y, color, count=10):
+        """Generate particle burst at specified location"""
+        self.particles.spawn(x, y, color, count)
+
+    def update_particles(self):
+        """Update all particles and remove expired ones"""
+        self.particles.update()
+
+    def draw_particles(self):
+        """Render all active particles"""
+        return self.particles.draw(self.surface)
+
+    def handle_events(self, engine):
+        """Turn the engine's events for the last tick into visual effects"""
+        scale = self.quality.particles
+        for event in engine.events:
+            if event[0] == EVENT_BLOCK_HIT:
+                self.create_particles(event[1], event[2], block_color(event[3]), round(8 * scale))
+                self.wall_cache.mark_dirty(event[4], event[5])
+            elif event[0] == EVENT_PADDLE_HIT:
+                self.create_particles(event[1], event[2], (255, 255, 255), round(5 * scale))
+
+    def draw_animated_background(self):
+        """Render the drifting parallax starfield"""
+        self.starfield.update()
+        return self.starfield.draw(self.clock())
+
+    def draw_wall(self, wall):
+        """Render all active blocks from the cached wall surfaces"""
+        return self.wall_cache.draw(self.surface, wall, self.clock())
+
+    def atlas(self, ball_radius, paddle_size):
+        """Sprite atlas for the current ball and paddle, rebuilt if either changed size"""
+        if not self.sprite_atlas.fits(ball_radius, paddle_size):
+            self.sprite_atlas = SpriteAtlas(self.surface, ball_radius, paddle_size)
+        return self.sprite_atlas
+
+    def draw_paddle(self, paddle):
+        """Render paddle with glow and visual details"""
+        # Dynamic glow effect based on movement
+        if abs(paddle.direction) > 0:
+            self.paddle_glow = min(max_paddle_glow, self.paddle_glow + 5)
+        else:
+            self.paddle_glow = max(0, self.paddle_glow - 2)
+
+        # Glow outline when moving
+        atlas = self.atlas(self.sprite_atlas.ball_radius, paddle.rect.size)
+        rect = paddle.rect.inflate(10, 10)
+        if self.paddle_glow > 0:
+            self.surface.blit(atlas.sprites[('glow', self.paddle_glow)], rect)
+        self.surface.blit(atlas.sprites['paddle'], paddle.rect)
+        return rect
+
+    def draw_balls(self, balls, alpha=1.0):
+        """Render every ball's trail, then the balls with glow at their interpolated positions, in one batch"""
+        count = balls.count
+        atlas = self.sprite_atlas
+        if balls.radius != atlas.ball_radius:
+            atlas = self.atlas(balls.radius, atlas.paddle_size)
+
+        # Motion trails, from the newest trail_points points; balls share a dot sequence per trail length
+        batches = []
+        lengths = np.minimum(balls.trail_count[:count], self.quality.trail)
+        for length in np.unique(lengths).tolist():
+            dots = atlas.trail(length)
+            if not dots:
+                continue
+            points = balls.trail_points(len(dots))[lengths == length]
+            sizes = np.array([size for _, size in dots])
+            x = (points[:, :, 0] - sizes).ravel().tolist()
+            y = (points[:, :, 1] - sizes).ravel().tolist()
+            sprites = [dot for dot, _ in dots] * len(points)
+            batches.append(zip(sprites, zip(x, y)))
+
+        # Main balls with glow effect
+        prev_x = balls.prev_x[:count]
+        prev_y = balls.prev_y[:count]
+        x = np.rint(prev_x + (balls.fx[:count] - prev_x) * alpha).astype(np.int32) - 3
+        y = np.rint(prev_y + (balls.fy[:count] - prev_y) * alpha).astype(np.int32) - 3
+        batches.append(zip(repeat(atlas.sprites['ball'], count), zip(x.tolist(), y.tolist())))
+        return self.surface.blits(chain.from_iterable(batches))
+
+    def draw_text(self, text, font, text_col, x, y, glow=False):
+        """Render text with optional glow effect from the text cache"""
+        return self.text_cache.draw(self.surface, text, font, text_col, x, y, glow)
+
+    def draw_ui(self, engine):
+        """Display game interface elements"""
+        rects = [self.draw_text(f'Score: {engine.score}', self.small_font, text_col, 10, 10),
+                 self.draw_text(f'Level: {engine.level}', self.small_font, text_col, 10, 35)]
+
+        # Combo multiplier display
+        if engine.combo_count > 1:
+            if combo_alpha(engine) > 0:
+                combo_text = f'Combo x{engine.combo_count}!'
+                combo_width = self.text_cache.size(combo_text, self.small_font, text_col, True)[0]
+                rects.append(self.draw_text(combo_text, self.small_font, text_col,
+                                            self.width - combo_width - 10, 10, True))
+
+        # Visual lives indicator
+        heart = self.sprite_atlas.sprites['heart']
+        rects.extend(self.surface.blits(
+            [(heart, (self.width - 40 - (i * 25) - heart_size // 2, self.height - 25 - heart_size // 2))
+             for i in range(3)]))
+        return rects
+
+    def draw_centered(self, text, font, color, y, glow=False):
+        """Render text horizontally centred on the screen"""
+        text_width = self.text_cache.size(text, font, color, glow)[0]
+        return self.draw_text(text, font, color, (self.width - text_width) // 2, y, glow)
+
+    def state_screen_lines(self, engine):
+        """Text lines of the menu, victory or game over screen as (text, font, color, y, glow).
+
+        A color of None marks a line drawn in the pulsing text color.
+        """
+        mid_y = self.height // 2
+        if engine.game_over == 0:
+            # Main menu display
+            return [('BREAKOUT GAME', self.large_font, None, mid_y - 50, True),
+                    ('CLICK ANYWHERE TO START', self.font, text_col, mid_y + 100, False),
+                    ('Move mouse to control paddle', self.small_font, text_col, mid_y + 130, False)]
+
+        elif engine.game_over == 1:
+            # Victory screen display
+            return [('VICTORY!', self.large_font, (100, 255, 100), mid_y + 20, True),
+                    (f'Final Score: {engine.score}', self.font, None, mid_y + 70, False),
+                    ('CLICK TO PLAY AGAIN', self.font, text_col, mid_y + 100, False)]
+
+        elif engine.game_over == -1:
+            # Game over screen display
+            return [('GAME OVER', self.large_font, text_col, mid_y + 20, True),
+                    (f'Final Score: {engine.score}', self.font, None, mid_y + 70, False),
+                    ('CLICK TO TRY AGAIN', self.font, text_col, mid_y + 100, False)]
+        return []
+
+    def draw_state_screen(self, engine):
+        """Render the menu, victory or game over screen"""
+        # Pulsing text effect
+        pulse_color = menu_pulse.color(self.clock())
+        rects = [self.draw_centered(text, font, pulse_color if color is None else color, y, glow)
+                 for text, font, color, y, glow in self.state_screen_lines(engine)]
+        self.mark(rects)
+        return rects
+
+    def settled(self, engine):
+        """Whether only the background and the pulsing text would still change between frames"""
+        return (not engine.live_ball and len(self.particles) == 0 and self.paddle_glow == 0
+                and (engine.combo_count <= 1 or combo_alpha(engine) == 0))
+
+    def draw_idle_screen(self, engine):
+        """Redraw only the pulsing text of a settled menu or end screen.
+
+        The first idle frame draws the whole scene and its fixed text once
+        and keeps a copy of it. Later frames restore the pulsing lines from
+        that copy and draw them in the new color, so the starfield and wall
+        animations hold still until play resumes.
+        """
+        lines = self.state_screen_lines(engine)
+        if self.idle_backdrop is None:
+            self.draw_scene(engine)
+            for text, font, color, y, glow in lines:
+                if color is not None:
+                    self.draw_centered(text, font, color, y, glow)
+            self.idle_backdrop = self.surface.copy()
+            self.idle_rects = []
+            rects = [self.surface.get_rect()]
+        else:
+            for rect in self.idle_rects:
+                self.surface.blit(self.idle_backdrop, rect, rect)
+            rects = self.idle_rects
+
+        pulse_color = menu_pulse.color(self.clock())
+        self.idle_rects = [self.draw_centered(text, font, pulse_color, y, glow)
+                           for text, font, color, y, glow in lines if color is None]
+        self.pending_update = rects + self.idle_rects
+        return self.pending_update
+
+    def mark(self, rects):
+        """Record drawn regions for the next dirty-rect update"""
+        if self.dirty is not None:
+            self.dirty.add(rects)
+
+    def draw_scene(self, engine, alpha=1.0):
+        """Render the playfield, interpolating alpha of the way through the last tick"""
+        lap = self.profiler.lap
+
+        # Idle frames bypass the dirty-rect tracking, so the first frame after them updates everything
+        if self.idle_backdrop is not None:
+            self.idle_backdrop = None
+            if self.dirty is not None:
+                self.dirty.invalidate()
+
+        # Background rendering
+        self.surface.fill(bg)
+        self.mark(self.draw_animated_background())
+        lap('background')
+
+        # Particle system update
+        self.update_particles()
+        self.mark(self.draw_particles())
+        lap('particles')
+
+        # Game object rendering
+        self.mark(self.draw_wall(engine.wall))
+        lap('wall')
+        self.mark(self.draw_paddle(engine.player_paddle))
+        lap('paddle')
+        self.mark(self.draw_balls(engine.balls, alpha))
+        lap('ball')
+
+        # Interface display
+        self.mark(self.draw_ui(engine))
+        lap('ui')
+
+    def present(self):
+        """Push the finished frame to the display"""
+        if self.pending_update is not None:
+            pygame.display.update(self.pending_update)
+            self.pending_update = None
+        elif self.dirty is not None:
+            self.dirty.flush()
+        else:
+            pygame.display.update()
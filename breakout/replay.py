@@ -0,0 +1,242 @@
+"""Deterministic input recording and headless replay.
+
+A replay log holds the engine configuration, RNG seed and wall layout, the
+paddle input for every tick, the ticks at which a round was launched and the
+final score and block state. Replaying feeds the same inputs to a fresh
+engine as fast as the CPU allows and checks that it ends in the same state:
+
+    python -m breakout.replay verify session.brk
+"""
+import argparse
+import struct
+import sys
+import time
+import zlib
+from array import array
+
+from .engine import BreakoutEngine
+
+
+MAGIC = b'BRKR'
+VERSION = 4
+
+# seed, cols, rows, width, height, fps, block_height, paddle_width, swept, substeps, ball_speed,
+# multiball chance, balls per split, ball limit, ball collisions
+HEADER = struct.Struct('<4sBQIIHHHHHBBBdBHB')
+# tick count, launch count, final score, block state crc, block count
+FOOTER = struct.Struct('<IIiII')
+
+# Largest value each integer header field holds. Paddle inputs are stored as 16-bit signed
+# numbers, so the board may be no wider than they reach
+FIELD_LIMITS = {
+    'cols': 2 ** 32 - 1,
+    'rows': 2 ** 32 - 1,
+    'width': 2 ** 15 - 1,
+    'height': 2 ** 16 - 1,
+    'fps': 2 ** 16 - 1,
+    'block_height': 2 ** 16 - 1,
+    'paddle_width': 2 ** 16 - 1,
+    'substeps': 2 ** 8 - 1,
+    'ball_speed': 2 ** 8 - 1,
+    'multiball_count': 2 ** 8 - 1,
+    'max_balls': 2 ** 16 - 1,
+}
+
+
+class ReplayError(Exception):
+    """Raised for malformed replay logs"""
+
+
+def check_config(config):
+    """Raise ReplayError if a configuration value does not fit its header field"""
+    for name, limit in FIELD_LIMITS.items():
+        if not 0 <= config[name] <= limit:
+            raise ReplayError(f'cannot record {name}={config[name]}, replay logs hold 0 to {limit}')
+
+
+def engine_config(engine):
+    """Constructor arguments that rebuild an engine with the same rules"""
+    return {
+        'cols': engine.cols,
+        'rows': engine.rows,
+        'width': engine.width,
+        'height': engine.height,
+        'fps': engine.fps,
+        'block_height': engine.wall.height,
+        'paddle_width': engine.player_paddle.paddle_width,
+        'swept': engine.swept,
+        'substeps': engine.substeps,
+        'ball_speed': engine.ball_speed,
+        'multiball_chance': engine.multiball_chance,
+        'multiball_count': engine.multiball_count,
+        'max_balls': engine.max_balls,
+        'ball_collisions': engine.ball_collisions,
+    }
+
+
+class ReplayRecorder:
+    """Wraps an engine and records every launch and per-tick paddle input.
+
+    Raises ReplayError up front for an engine whose configuration the log
+    format cannot hold, rather than losing the recording when it is saved.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.config = engine_config(engine)
+        check_config(self.config)
+        self.seed = engine.seed
+        self.layout = bytes(engine.wall.layout)
+        self.inputs = array('h')
+        self.launches = array('I')
+
+    def launch(self):
+        """Start a round and note the tick it happened on"""
+        if not self.engine.live_ball:
+            self.launches.append(len(self.inputs))
+        self.engine.launch()
+
+    def step(self, paddle_x):
+        """Record the input and advance the engine one tick"""
+        self.inputs.append(int(paddle_x))
+        return self.engine.step(paddle_x)
+
+    def truncate(self, ticks):
+        """Forget the input after tick ticks, once the engine has been rewound to it"""
+        del self.inputs[ticks:]
+        while self.launches and self.launches[-1] >= ticks:
+            self.launches.pop()
+
+    def save(self, path):
+        """Write the log, including the final state for verification"""
+        with open(path, 'wb') as handle:
+            handle.write(encode(self.seed, self.config, self.layout, self.inputs, self.launches, self.engine))
+
+
+def pack_header(magic, version, seed, config):
+    """File header holding the seed and engine configuration"""
+    return HEADER.pack(magic, version, seed, config['cols'], config['rows'], config['width'],
+                       config['height'], config['fps'], config['block_height'], config['paddle_width'],
+                       int(config['swept']), config['substeps'], config['ball_speed'],
+                       config['multiball_chance'], config['multiball_count'], config['max_balls'],
+                       int(config['ball_collisions']))
+
+
+def unpack_header(data):
+    """(magic, version, seed, config) from a header written by pack_header"""
+    (magic, version, seed, cols, rows, width, height, fps, block_height, paddle_width,
+     swept, substeps, ball_speed, multiball_chance, multiball_count, max_balls,
+     ball_collisions) = HEADER.unpack_from(data)
+    config = {
+        'cols': cols,
+        'rows': rows,
+        'width': width,
+        'height': height,
+        'fps': fps,
+        'block_height': block_height,
+        'paddle_width': paddle_width,
+        'swept': bool(swept),
+        'substeps': substeps,
+        'ball_speed': ball_speed,
+        'multiball_chance': multiball_chance,
+        'multiball_count': multiball_count,
+        'max_balls': max_balls,
+        'ball_collisions': bool(ball_collisions),
+    }
+    return magic, version, seed, config
+
+
+def encode(seed, config, layout, inputs, launches, engine):
+    """Serialize a replay log to bytes"""
+    header = pack_header(MAGIC, VERSION, seed, config)
+
+    # Paddle positions change little from tick to tick, so deltas compress well
+    deltas = array('h', inputs)
+    for i in range(len(deltas) - 1, 0, -1):
+        deltas[i] = (deltas[i] - deltas[i - 1] + 32768) % 65536 - 32768
+    payload = zlib.compress(layout + launches.tobytes() + deltas.tobytes(), 9)
+
+    state = engine.block_state()
+    footer = FOOTER.pack(len(inputs), len(launches), engine.score, zlib.crc32(state), len(state))
+    return header + footer + payload
+
+
+def decode(data):
+    """Parse a replay log into (seed, config, inputs, launches, expected)"""
+    if len(data) < HEADER.size + FOOTER.size:
+        raise ReplayError('replay log is truncated')
+    magic, version, seed, config = unpack_header(data)
+    cols, rows = config['cols'], config['rows']
+    if magic != MAGIC:
+        raise ReplayError('not a replay log')
+    if version != VERSION:
+        raise ReplayError(f'unsupported replay version {version}')
+    tick_count, launch_count, score, state_crc, block_count = FOOTER.unpack_from(data, HEADER.size)
+
+    try:
+        payload = zlib.decompress(data[HEADER.size + FOOTER.size:])
+    except zlib.error as error:
+        raise ReplayError(f'corrupt replay payload: {error}') from None
+    layout = payload[:cols * rows]
+    launches = array('I')
+    launches_end = cols * rows + launch_count * launches.itemsize
+    launches.frombytes(payload[cols * rows:launches_end])
+    inputs = array('h')
+    inputs.frombytes(payload[launches_end:])
+    if len(layout) != cols * rows or len(launches) != launch_count or len(inputs) != tick_count:
+        raise ReplayError('replay payload does not match its header')
+    for i in range(1, len(inputs)):
+        inputs[i] = (inputs[i] + inputs[i - 1] + 32768) % 65536 - 32768
+
+    config['layout'] = layout
+    expected = {'score': score, 'state_crc': state_crc, 'blocks': block_count}
+    return seed, config, inputs, launches, expected
+
+
+def replay(data):
+    """Re-run a replay log headless and return (engine, expected, matches)"""
+    seed, config, inputs, launches, expected = decode(data)
+    engine = BreakoutEngine(seed=seed, **config)
+    launch_index = 0
+    step = engine.step
+    for tick, paddle_x in enumerate(inputs):
+        while launch_index < len(launches) and launches[launch_index] == tick:
+            engine.launch()
+            launch_index += 1
+        step(paddle_x)
+    while launch_index < len(launches):
+        engine.launch()
+        launch_index += 1
+
+    state = engine.block_state()
+    matches = (engine.score == expected['score'] and len(state) == expected['blocks']
+               and zlib.crc32(state) == expected['state_crc'])
+    return engine, expected, matches
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Verify Breakout replay logs')
+    parser.add_argument('command', choices=['verify'])
+    parser.add_argument('paths', nargs='+')
+    args = parser.parse_args(argv)
+
+    failures = 0
+    for path in args.paths:
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        start = time.perf_counter()
+        try:
+            engine, expected, matches = replay(data)
+        except ReplayError as error:
+            print(f'{path}: ERROR {error}')
+            failures += 1
+            continue
+        elapsed = time.perf_counter() - start
+        status = 'OK' if matches else 'MISMATCH'
+        print(f'{path}: {status} score={engine.score} expected={expected["score"]} '
+              f'ticks={engine.ticks} ({engine.ticks / max(elapsed, 1e-9):.0f} ticks/s)')
+        failures += not matches
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
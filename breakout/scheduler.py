@@ -0,0 +1,56 @@
+"""Frame pacing that slows down while the game is idle"""
+import pygame
+
+
+# Event types that count as player input and bring back the full frame rate
+INPUT_EVENTS = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.KEYDOWN,
+                pygame.KEYUP)
+
+
+class FrameScheduler:
+    """Runs frames at ``fps`` during play and at ``idle_fps`` while idle.
+
+    The main loop reports whether the scene has settled: no ball in play and
+    no effect still fading out. Once it has stayed settled with no input for
+    ``idle_delay`` milliseconds the scheduler goes idle and sleeps in
+    ``pygame.event.wait`` between frames instead of spinning at full rate.
+    Any event ends the sleep at once; it is posted back so the main loop
+    still handles it, and the frame after it runs at full rate. An
+    ``idle_fps`` of 0 never goes idle.
+    """
+    def __init__(self, clock, fps, idle_fps, idle_delay):
+        self.clock = clock
+        self.fps = fps
+        self.idle_interval = 1000 // idle_fps if idle_fps > 0 else None
+        self.idle_delay = idle_delay
+        self.last_input = 0
+        self.last_frame = 0
+        self.idle = False
+
+    def wake(self):
+        """Note player input, which keeps the full frame rate for another idle_delay"""
+        self.last_input = pygame.time.get_ticks()
+        self.idle = False
+
+    def handle_event(self, event):
+        """Wake on input events"""
+        if event.type in INPUT_EVENTS:
+            self.wake()
+
+    def tick(self, settled):
+        """Wait for the next frame and return the seconds since the previous one"""
+        now = pygame.time.get_ticks()
+        self.idle = (settled and self.idle_interval is not None and now - self.last_input >= self.idle_delay)
+        if self.idle:
+            # Sleep until the next idle frame is due, or until an event arrives
+            timeout = self.idle_interval - (now - self.last_frame)
+            if timeout > 0:
+                event = pygame.event.wait(timeout)
+                if event.type != pygame.NOEVENT:
+                    pygame.event.post(event)
+                    self.wake()
+            elapsed = self.clock.tick()
+        else:
+            elapsed = self.clock.tick(self.fps)
+        self.last_frame = pygame.time.get_ticks()
+        return elapsed / 1000
@@ -0,0 +1,44 @@
+"""Shared configuration for the Breakout game"""
+
+# Screen configuration
+screen_width = 600
+screen_height = 600
+
+# Color definitions
+bg = (234, 218, 184)
+block_red = (255, 165, 0)
+block_green = (255, 255, 0)
+block_blue = (69, 177, 232)
+paddle_col = (142, 135, 123)
+paddle_outline = (100, 100, 100)
+text_col = (78, 81, 139)
+particle_colors = [(255, 255, 255), (255, 255, 150), (150, 255, 150), (150, 150, 255)]
+
+# Game configuration
+cols = 6
+rows = 6
+fps = 60
+
+# Physics configuration
+swept_collisions = False
+physics_substeps = 1
+ball_speed = 4
+
+# Multi-ball power-up configuration
+multiball_chance = 0.1
+multiball_count = 2
+max_balls = 500
+
+# Frame rate of settled menu and end screens, after this many seconds without input
+idle_fps = 15
+idle_seconds = 1
+
+# Rewind history and checkpoint interval
+rewind_seconds = 5
+checkpoint_seconds = 10
+
+# Effects configuration
+max_particles = 2000
+trail_length = 8
+star_count = 20
+star_layers = 3
@@ -0,0 +1,318 @@
+"""Engine snapshots, crash-safe checkpoints and a rewind history.
+
+``snapshot`` packs everything that decides how a game continues into one
+bytes object: the engine counters, its RNG state when multi-ball can draw
+from it, the block strengths, the paddle, every ball with its trail and the
+broadphase order, and optionally a particle pool. ``restore`` writes it
+back into an engine built with the same configuration and layout, after
+which stepping it with the same input reproduces the original game exactly.
+Checkpoint files add that configuration and layout, so they can be resumed
+on their own.
+"""
+import os
+import struct
+import zlib
+from collections import deque
+
+import numpy as np
+
+from .engine import BreakoutEngine
+from .replay import HEADER, engine_config, pack_header, unpack_header
+from .settings import trail_length
+
+
+MAGIC = b'BRKS'
+VERSION = 1
+
+# cols, rows, ticks, score, level, blocks destroyed, blocks remaining, combo, last hit time, live ball,
+# game over, pending multi-ball, paddle x, y, width, height and direction, ball count, broadphase order
+# count, RNG flag, particle flag
+STATE = struct.Struct('<HHIiHIIIqBbHiiiibIIBB')
+# RNG version, Mersenne Twister state and position, pending gauss value (NaN for none)
+RNG = struct.Struct('<B625Id')
+# x, y, width, height, fx, fy, prev_x, prev_y, speed_x, speed_y, speed_max, game over, trail points,
+# packed back to back for every ball
+BALL = np.dtype([('x', '<i4'), ('y', '<i4'), ('width', '<i4'), ('height', '<i4'), ('fx', '<f8'), ('fy', '<f8'),
+                 ('prev_x', '<f8'), ('prev_y', '<f8'), ('speed_x', '<i4'), ('speed_y', '<i4'),
+                 ('speed_max', '<i4'), ('game_over', 'i1'), ('trail_count', 'u1')])
+# Fields copied straight between the ball arrays and the packed records
+BALL_ARRAYS = ('x', 'y', 'fx', 'fy', 'prev_x', 'prev_y', 'speed_x', 'speed_y', 'speed_max', 'game_over',
+               'trail_count')
+# particle count, palette size
+PARTICLES = struct.Struct('<II')
+# length of the snapshot a delta rebuilds
+DELTA = struct.Struct('<I')
+
+
+class SnapshotError(Exception):
+    """Raised for snapshots that do not fit the engine or are corrupt"""
+
+
+def particle_arrays(particles):
+    """The pool's per-particle arrays in a fixed order"""
+    return (particles.x, particles.y, particles.vx, particles.vy, particles.life, particles.size,
+            particles.color)
+
+
+def snapshot(engine, particles=None):
+    """Pack the engine, and particles when given, into bytes"""
+    player_paddle = engine.player_paddle
+    paddle_rect = player_paddle.rect
+    balls = engine.balls
+    order = engine.broadphase.order
+    order_count = len(order) if order is not None else 0
+    # Only the multi-ball power-up draws from the RNG, so without it the state never changes
+    has_rng = engine.multiball_chance > 0
+    parts = [STATE.pack(engine.cols, engine.rows, engine.ticks, engine.score, engine.level,
+                        engine.blocks_destroyed, engine.wall.blocks_remaining, engine.combo_count,
+                        engine.last_hit_time, engine.live_ball, engine.game_over, engine.multiball_pending,
+                        paddle_rect.x, paddle_rect.y, paddle_rect.width, paddle_rect.height,
+                        player_paddle.direction, balls.count, order_count, has_rng, particles is not None)]
+
+    if has_rng:
+        version, state, gauss = engine.rng.getstate()
+        parts.append(RNG.pack(version, *state, float('nan') if gauss is None else gauss))
+    parts.append(bytes(engine.wall.strength))
+
+    # Every ball's fields, then every trail point
+    count = balls.count
+    records = np.empty(count, BALL)
+    for name in BALL_ARRAYS:
+        records[name] = getattr(balls, name)[:count]
+    records['width'] = balls.width
+    records['height'] = balls.height
+    parts.append(records.tobytes())
+    points = balls.trail_points(trail_length)
+    parts.append(points[np.arange(trail_length) >= trail_length - balls.trail_count[:count, None]].tobytes())
+    if order_count:
+        parts.append(order.astype(np.int32).tobytes())
+
+    if particles is not None:
+        count = particles.count
+        parts.append(PARTICLES.pack(count, len(particles.colors)))
+        parts.append(bytes(value for color in particles.colors for value in color))
+        parts.extend(values[:count].tobytes() for values in particle_arrays(particles))
+    return b''.join(parts)
+
+
+def restore(engine, data, particles=None):
+    """Put an engine, and particles when given and saved, back into a snapshot's state.
+
+    The whole snapshot is unpacked and checked before anything is written, so
+    a truncated or corrupt one raises SnapshotError and leaves the engine and
+    particles as they were.
+    """
+    try:
+        (cols, rows, ticks, score, level, blocks_destroyed, blocks_remaining, combo_count, last_hit_time,
+         live_ball, game_over, multiball_pending, paddle_x, paddle_y, paddle_width, paddle_height,
+         direction, ball_count, order_count, has_rng, has_particles) = STATE.unpack_from(data)
+    except struct.error:
+        raise SnapshotError('snapshot is truncated') from None
+    if (cols, rows) != (engine.cols, engine.rows):
+        raise SnapshotError(f'snapshot is for a {cols}x{rows} wall, not {engine.cols}x{engine.rows}')
+    balls = engine.balls
+    if not 1 <= ball_count <= balls.capacity:
+        raise SnapshotError(f'snapshot holds {ball_count} balls, the engine takes 1 to {balls.capacity}')
+
+    offset = STATE.size
+    try:
+        rng = None
+        if has_rng:
+            rng = RNG.unpack_from(data, offset)
+            offset += RNG.size
+        strength = data[offset:offset + cols * rows]
+        offset += cols * rows
+        if len(strength) != cols * rows:
+            raise SnapshotError('snapshot is truncated')
+
+        records = np.frombuffer(data, BALL, ball_count, offset)
+        offset += records.nbytes
+        trail_counts = records['trail_count'].astype(np.intp)
+        points = np.frombuffer(data, np.int32, int(trail_counts.sum()) * 2, offset).reshape(-1, 2)
+        offset += points.nbytes
+        order = np.frombuffer(data, np.int32, order_count, offset).astype(np.intp) if order_count else None
+        offset += order_count * 4
+        saved_particles = None
+        if has_particles and particles is not None:
+            saved_particles = unpack_particles(particles, data, offset)
+    except (struct.error, ValueError):
+        raise SnapshotError('snapshot is truncated') from None
+    if (np.any(records['width'] != balls.width) or np.any(records['height'] != balls.height)
+            or np.any(trail_counts > trail_length)):
+        raise SnapshotError('snapshot balls do not fit the engine')
+
+    engine.ticks = ticks
+    engine.score = score
+    engine.level = level
+    engine.blocks_destroyed = blocks_destroyed
+    engine.combo_count = combo_count
+    engine.last_hit_time = last_hit_time
+    engine.live_ball = bool(live_ball)
+    engine.game_over = game_over
+    engine.multiball_pending = multiball_pending
+    engine.events.clear()
+    engine.broadphase.order = order
+    if rng is not None:
+        engine.rng.setstate((rng[0], rng[1:626], None if rng[626] != rng[626] else rng[626]))
+
+    # The grid index shares the strength buffer, so it is refilled in place
+    wall = engine.wall
+    wall.strength[:] = strength
+    wall.blocks_remaining = blocks_remaining
+    wall.generation += 1
+
+    player_paddle = engine.player_paddle
+    player_paddle.rect.update(paddle_x, paddle_y, paddle_width, paddle_height)
+    player_paddle.direction = direction
+
+    # Trails are written to end at ring position 0
+    for name in BALL_ARRAYS:
+        getattr(balls, name)[:ball_count] = records[name]
+    balls.count = ball_count
+    balls.head = 0
+    newest = np.arange(trail_length) >= trail_length - trail_counts[:, None]
+    balls.trail[:ball_count][newest] = points
+
+    if saved_particles is not None:
+        restore_particles(particles, *saved_particles)
+
+
+def unpack_particles(particles, data, offset):
+    """(count, colors, arrays) of a snapshot's particle section, checked against the pool"""
+    count, palette_size = PARTICLES.unpack_from(data, offset)
+    offset += PARTICLES.size
+    palette = data[offset:offset + palette_size * 3]
+    offset += palette_size * 3
+    if len(palette) != palette_size * 3:
+        raise SnapshotError('snapshot is truncated')
+    if count > particles.capacity:
+        raise SnapshotError(f'snapshot holds {count} particles, more than the pool capacity')
+
+    arrays = []
+    for values in particle_arrays(particles):
+        arrays.append(np.frombuffer(data, values.dtype, count, offset))
+        offset += count * values.itemsize
+    if count and int(arrays[-1].max()) >= palette_size:
+        raise SnapshotError('snapshot particle colors are corrupt')
+    colors = [tuple(palette[i:i + 3]) for i in range(0, len(palette), 3)]
+    return count, colors, arrays
+
+
+def restore_particles(particles, count, colors, arrays):
+    """Refill a particle pool from the unpacked particle section of a snapshot"""
+    # Palette slots of this pool for the snapshot's colors, which may have been registered in another order
+    slots = np.array([particles.color_index(color) for color in colors], dtype=np.uint8)
+    for values, saved in zip(particle_arrays(particles), arrays):
+        values[:count] = saved
+    if count:
+        particles.color[:count] = slots[particles.color[:count]]
+    particles.count = count
+
+
+def save_checkpoint(path, engine, particles=None):
+    """Write the engine's configuration, layout and state to path.
+
+    The file is written under a temporary name, synced and then renamed over
+    path, so a crash never leaves a partial checkpoint behind.
+    """
+    data = (pack_header(MAGIC, VERSION, engine.seed, engine_config(engine)) + bytes(engine.wall.layout)
+            + zlib.compress(snapshot(engine, particles), 1))
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as handle:
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path, particles=None):
+    """A new engine in the state saved to a checkpoint file, restoring particles when given"""
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    if len(data) < HEADER.size:
+        raise SnapshotError('checkpoint is truncated')
+    magic, version, seed, config = unpack_header(data)
+    if magic != MAGIC:
+        raise SnapshotError('not a checkpoint')
+    if version != VERSION:
+        raise SnapshotError(f'unsupported checkpoint version {version}')
+    layout_end = HEADER.size + config['cols'] * config['rows']
+    try:
+        state = zlib.decompress(data[layout_end:])
+    except zlib.error as error:
+        raise SnapshotError(f'corrupt checkpoint: {error}') from None
+    engine = BreakoutEngine(seed=seed, layout=data[HEADER.size:layout_end], **config)
+    restore(engine, state, particles)
+    return engine
+
+
+def xor_bytes(first, second, size):
+    """Bytewise XOR of two byte strings, each zero-padded to size"""
+    return (int.from_bytes(first, 'little') ^ int.from_bytes(second, 'little')).to_bytes(size, 'little')
+
+
+def encode_delta(base, target):
+    """Compressed difference that turns base back into target"""
+    size = max(len(base), len(target))
+    return DELTA.pack(len(target)) + zlib.compress(xor_bytes(base, target, size), 1)
+
+
+def apply_delta(base, delta):
+    """The snapshot a delta from encode_delta rebuilds from base"""
+    length, = DELTA.unpack_from(delta)
+    difference = zlib.decompress(delta[DELTA.size:])
+    return xor_bytes(base, difference, len(difference))[:length]
+
+
+class RewindBuffer:
+    """Bounded history of snapshots, one per recorded tick, for rewinding.
+
+    Only the newest snapshot is kept whole. Each older one is stored as the
+    compressed XOR against the snapshot after it, which is almost all zeros
+    because little changes in a tick, so a few seconds of history take tens
+    of kilobytes. Rewinding undoes the newest deltas first, and once
+    ``capacity`` deltas are held the oldest simply falls off the end.
+
+    Particles are left out unless a pool is given; they move every tick, so
+    their deltas barely compress.
+    """
+    def __init__(self, engine, capacity, particles=None):
+        self.engine = engine
+        self.particles = particles
+        self.deltas = deque(maxlen=capacity)
+        self.latest = None
+
+    def __len__(self):
+        return len(self.deltas) + (self.latest is not None)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the snapshot and deltas"""
+        return sum(len(delta) for delta in self.deltas) + (len(self.latest) if self.latest else 0)
+
+    def record(self):
+        """Remember the engine's current state as the newest snapshot"""
+        state = snapshot(self.engine, self.particles)
+        if self.latest is not None:
+            self.deltas.append(encode_delta(state, self.latest))
+        self.latest = state
+
+    def rewind(self, ticks=1):
+        """Restore the state from ticks snapshots back, or the oldest one held.
+
+        Returns the number of snapshots actually stepped back.
+        """
+        if self.latest is None:
+            return 0
+        steps = min(ticks, len(self.deltas))
+        state = self.latest
+        for _ in range(steps):
+            state = apply_delta(state, self.deltas.pop())
+        self.latest = state
+        restore(self.engine, state, self.particles)
+        return steps
+
+    def clear(self):
+        """Forget every snapshot"""
+        self.deltas.clear()
+        self.latest = None
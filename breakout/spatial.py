@@ -0,0 +1,35 @@
+"""Uniform grid index for fast block lookups"""
+
+
+class BlockGrid:
+    """Uniform grid index over a wall's flat block strength array.
+
+    Blocks sit on a regular grid, so the cells a rect overlaps follow from its
+    coordinates alone. ``query`` only visits those cells, so its cost depends
+    on the size of the queried rect rather than on how many blocks the wall
+    holds, and destroyed blocks (strength 0) need no bookkeeping.
+    """
+    def __init__(self, cell_width, cell_height, cols, rows, strength):
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.cols = cols
+        self.rows = rows
+        self.strength = strength
+
+    def cell_range(self, rect):
+        """Column and row spans of the cells overlapped by rect, clipped to the grid"""
+        col_start = max(0, rect.left // self.cell_width)
+        col_end = min(self.cols - 1, (rect.right - 1) // self.cell_width)
+        row_start = max(0, rect.top // self.cell_height)
+        row_end = min(self.rows - 1, (rect.bottom - 1) // self.cell_height)
+        return col_start, col_end, row_start, row_end
+
+    def query(self, rect):
+        """(row, col) of live blocks in the cells overlapped by rect, in row-major order"""
+        col_start, col_end, row_start, row_end = self.cell_range(rect)
+        strength = self.strength
+        cols = self.cols
+        return [(row, col)
+                for row in range(row_start, row_end + 1)
+                for col in range(col_start, col_end + 1)
+                if strength[row * cols + col]]
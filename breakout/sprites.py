@@ -0,0 +1,106 @@
+"""Sprite atlas holding the pre-rendered ball, trail, heart and paddle shapes"""
+import pygame
+
+from .palette import paddle_palette
+from .settings import paddle_col, paddle_outline
+from .wall_cache import EMPTY_KEY
+
+
+# Lighter shade of the ball used for its motion trail
+trail_color = paddle_palette.shade(paddle_col, 50)
+
+# Lives indicator colors and size
+heart_fill = (100, 150, 255)
+heart_outline = (80, 120, 200)
+heart_size = 15
+
+# Brightest paddle glow, reached while the paddle keeps moving
+max_paddle_glow = 50
+
+
+def draw_ball(surface, center, radius):
+    """Ball body with its white glow ring"""
+    pygame.draw.circle(surface, (255, 255, 255), center, radius + 3)
+    pygame.draw.circle(surface, paddle_col, center, radius)
+    pygame.draw.circle(surface, paddle_outline, center, radius, 3)
+
+
+def draw_heart(surface, center):
+    """One lives indicator"""
+    pygame.draw.circle(surface, heart_fill, center, heart_size // 2)
+    pygame.draw.circle(surface, heart_outline, center, heart_size // 2, 2)
+
+
+def draw_paddle_body(surface, rect):
+    """Paddle fill, outline and grip texture lines"""
+    pygame.draw.rect(surface, paddle_col, rect, border_radius=3)
+    pygame.draw.rect(surface, paddle_outline, rect, 3, border_radius=3)
+    for i in range(3):
+        line_x = rect.x + (rect.width // 4) * (i + 1)
+        pygame.draw.line(surface, paddle_outline, (line_x, rect.y + 5), (line_x, rect.y + rect.height - 5), 2)
+
+
+def paddle_glow_color(glow):
+    """Paddle color brightened by a glow intensity"""
+    return paddle_palette.shade(paddle_col, glow)
+
+
+class SpriteAtlas:
+    """Every ball, trail, heart and paddle shape, pre-rendered once.
+
+    Shapes are drawn when the atlas is built, with the same draw calls the
+    renderer used to issue every frame, so a frame only needs ``blits`` of
+    ``sprites[name]``. Trail dots come in every size up to the ball radius
+    and the paddle glow in every intensity it can reach. Each shape is its
+    own run-length encoded surface rather than a region of one sheet, since
+    SDL walks an encoded sheet from its top row to blit a region lower down.
+    """
+    def __init__(self, target, ball_radius=10, paddle_size=(100, 20)):
+        self.ball_radius = ball_radius
+        self.paddle_size = tuple(paddle_size)
+        self.target = target
+        self.sprites = {}
+        self.trails = {}
+
+        paddle_width, paddle_height = self.paddle_size
+        glow = ball_radius + 3
+        draw_ball(self.sprite('ball', glow * 2 + 1, glow * 2 + 1), (glow, glow), ball_radius)
+        draw_heart(self.sprite('heart', heart_size, heart_size), (heart_size // 2, heart_size // 2))
+        draw_paddle_body(self.sprite('paddle', paddle_width, paddle_height),
+                         pygame.Rect(0, 0, paddle_width, paddle_height))
+        for size in range(1, ball_radius + 1):
+            pygame.draw.circle(self.sprite(('dot', size), size * 2 + 1, size * 2 + 1), trail_color,
+                               (size, size), size)
+        for level in range(1, max_paddle_glow + 1):
+            pygame.draw.rect(self.sprite(('glow', level), paddle_width + 10, paddle_height + 10),
+                             paddle_glow_color(level), (0, 0, paddle_width + 10, paddle_height + 10),
+                             border_radius=5)
+        for sprite in self.sprites.values():
+            sprite.set_colorkey(EMPTY_KEY, pygame.RLEACCEL)
+
+    def sprite(self, name, width, height):
+        """New transparent sprite surface registered under name"""
+        sprite = pygame.Surface((width, height), 0, self.target)
+        sprite.fill(EMPTY_KEY)
+        self.sprites[name] = sprite
+        return sprite
+
+    def fits(self, ball_radius, paddle_size):
+        """Whether the atlas was built for this ball radius and paddle size"""
+        return ball_radius == self.ball_radius and tuple(paddle_size) == self.paddle_size
+
+    def trail(self, length):
+        """(sprite, size) of the dots drawn for the last points of a trail of the given length.
+
+        Dot size grows along the trail, so the skipped zero-size dots are
+        always the oldest points.
+        """
+        dots = self.trails.get(length)
+        if dots is None:
+            dots = []
+            for i in range(length):
+                trail_size = int(self.ball_radius * (i / length))
+                if trail_size > 0:
+                    dots.append((self.sprites[('dot', trail_size)], trail_size))
+            self.trails[length] = dots
+        return dots
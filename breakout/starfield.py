@@ -0,0 +1,143 @@
+"""Multi-layer parallax starfield stored as parallel NumPy arrays"""
+import numpy as np
+import pygame
+
+from .palette import SINE_MASK, STEPS_PER_RADIAN, star_pulse
+
+
+def disc_offsets(radius):
+    """(dx, dy) arrays of the pixels pygame.draw.circle fills for a disc of radius at the origin"""
+    size = radius * 2 + 3
+    stamp = pygame.Surface((size, size), 0, 32)
+    stamp.fill((0, 0, 0))
+    pygame.draw.circle(stamp, (255, 255, 255), (radius + 1, radius + 1), radius)
+    dx, dy = np.nonzero(pygame.surfarray.pixels2d(stamp))
+    return dx - (radius + 1), dy - (radius + 1)
+
+
+class StarLayer:
+    """One depth of the starfield: a slice of the star arrays sharing a disc size.
+
+    Only the stars before ``shown`` are drawn, which thins the layer out when
+    the starfield density is lowered.
+    """
+    def __init__(self, start, end, size, pitch):
+        self.start = start
+        self.end = end
+        self.shown = end
+        self.size = size
+        dx, dy = disc_offsets(size)
+        self.left, self.right = -int(dx.min()), int(dx.max())
+        self.top, self.bottom = -int(dy.min()), int(dy.max())
+        # Disc pixels as offsets into the target's flat pixel buffer
+        self.offsets = (dy * pitch + dx).astype(np.int64)
+
+
+class Starfield:
+    """Background stars drifting down the screen in parallax layers.
+
+    Layer 0 is the farthest away: its stars are the smallest and slowest,
+    and each nearer layer is larger and faster. Stars are kept sorted by
+    layer, so a layer is a slice of each array. ``update`` moves every star
+    in one vectorized step and respawns those that leave the bottom at a new
+    x above the top. ``draw`` writes each layer's discs, twinkling on
+    ``star_pulse``, straight into the target's pixels with one broadcast
+    assignment per layer. Only the few discs crossing the top or bottom edge
+    have their pixels clipped, and are written after the rest of their layer.
+    ``set_density`` draws only a fraction of each layer; every star keeps
+    moving, so the hidden ones reappear where they would have been.
+    """
+    respawn_y = -10
+    max_size = 3
+
+    # Beyond this many stars a single full-screen dirty rect is cheaper than one per star
+    max_dirty_rects = 64
+
+    def __init__(self, target, count=20, layers=3, rng=None):
+        self.target = target
+        self.width, self.height = target.get_size()
+        self.pitch = target.get_pitch() // target.get_bytesize()
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        # Stars sorted far to near, so nearer layers are written last and cover farther ones
+        self.layer = np.sort(self.rng.integers(0, layers, count))
+        self.size = 1 + self.layer * self.max_size // layers
+        starts = np.searchsorted(self.layer, np.arange(layers + 1))
+        self.layers = [StarLayer(int(starts[i]), int(starts[i + 1]), 1 + i * self.max_size // layers, self.pitch)
+                       for i in range(layers)]
+
+        band = 1.5 / layers
+        self.speed = (0.5 + band * self.layer + self.rng.uniform(0, band, count)).astype(np.float32)
+        self.x = np.zeros(count, dtype=np.int64)
+        self.y = self.rng.uniform(0, self.height, count).astype(np.float32)
+        self.phase = np.zeros(count, dtype=np.int64)
+        self.respawn(np.arange(count))
+
+        # star_pulse colors mapped to the target's pixel format
+        colors = np.array(star_pulse.colors, dtype=np.uint8).reshape(1, -1, 3)
+        self.colors = pygame.surfarray.map_array(target, colors)[0]
+        self.density = 1.0
+        self.shown = np.arange(count)
+
+    def __len__(self):
+        return len(self.x)
+
+    def set_density(self, density):
+        """Draw only the given fraction of the stars in every layer"""
+        self.density = density
+        for layer in self.layers:
+            layer.shown = layer.start + round((layer.end - layer.start) * density)
+        self.shown = np.concatenate([np.arange(layer.start, layer.shown) for layer in self.layers])
+
+    def respawn(self, stars):
+        """Pick a new x and twinkle phase for stars, keeping their discs inside the side edges"""
+        for layer in self.layers:
+            chosen = stars[(stars >= layer.start) & (stars < layer.end)]
+            if len(chosen):
+                self.x[chosen] = self.rng.integers(layer.left, self.width - layer.right, len(chosen))
+        self.phase[stars] = (self.x[stars] * STEPS_PER_RADIAN).astype(np.int64)
+
+    def update(self):
+        """Move every star down at its own speed, respawning those that fell off the bottom"""
+        self.y += self.speed
+        fallen = np.flatnonzero(self.y > self.height)
+        if len(fallen):
+            self.y[fallen] = self.respawn_y
+            self.respawn(fallen)
+
+    def draw(self, ticks):
+        """Write every star into the target surface and return the dirty rects"""
+        if len(self.shown) == 0:
+            return []
+        y = self.y.astype(np.int64)
+        base = y * self.pitch + self.x
+        colors = self.colors[(star_pulse.index(ticks) + self.phase) & SINE_MASK]
+
+        # A flat view of the locked pixel buffer, pitch padding included
+        pixels = pygame.surfarray.pixels2d(self.target)
+        flat = np.lib.stride_tricks.as_strided(pixels, ((self.height - 1) * self.pitch + self.width,),
+                                               (pixels.itemsize,))
+        for layer in self.layers:
+            if layer.start == layer.shown:
+                continue
+            rows = y[layer.start:layer.shown]
+            inside = (rows >= layer.top) & (rows < self.height - layer.bottom)
+            if inside.all():
+                flat[base[layer.start:layer.shown, None] + layer.offsets] = colors[layer.start:layer.shown, None]
+                continue
+
+            # Interior discs in one assignment, then the clipped pixels of those crossing an edge
+            stars = np.arange(layer.start, layer.shown)
+            interior = stars[inside]
+            flat[base[interior, None] + layer.offsets] = colors[interior, None]
+            edge = stars[~inside]
+            index = base[edge, None] + layer.offsets
+            visible = (index >= 0) & (index < len(flat))
+            flat[index[visible]] = np.broadcast_to(colors[edge, None], index.shape)[visible]
+        del flat, pixels
+
+        shown = self.shown
+        if len(shown) > self.max_dirty_rects:
+            return [self.target.get_rect()]
+        return [pygame.Rect(x - size, y - size, size * 2, size * 2)
+                for x, y, size in zip(self.x[shown].tolist(), y[shown].tolist(), self.size[shown].tolist())]
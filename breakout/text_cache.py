@@ -0,0 +1,86 @@
+"""LRU cache of rendered text surfaces"""
+from collections import OrderedDict
+
+import pygame
+
+
+# Offset of the text inside a composited glow surface
+GLOW_MARGIN = 2
+
+
+class TextCache:
+    """Rendered text keyed on (text, font, color, glow) with LRU eviction.
+
+    Glow text is composited once into a single surface holding the 24 white
+    offset copies and the coloured text on top, so drawing it afterwards is a
+    single blit instead of 25 renders and blits per frame. A smaller
+    ``glow_margin`` uses fewer copies, and 0 draws glow text plainly.
+    """
+    def __init__(self, capacity=128, glow_margin=GLOW_MARGIN):
+        self.capacity = capacity
+        self.glow_margin = glow_margin
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, text, font, color, glow=False):
+        """Surface for the text, rendering it only on a cache miss"""
+        key = (text, font, color, glow)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        if glow and self.glow_margin:
+            surface = render_glow(text, font, color, self.glow_margin)
+        else:
+            surface = font.render(text, True, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return surface
+
+    def size(self, text, font, color, glow=False):
+        """Width and height of the text as drawn, ignoring any glow margin"""
+        surface = self.get(text, font, color, glow)
+        if glow:
+            return surface.get_width() - 2 * self.glow_margin, surface.get_height() - 2 * self.glow_margin
+        return surface.get_size()
+
+    def draw(self, surface, text, font, color, x, y, glow=False):
+        """Blit cached text with its top-left corner at (x, y)"""
+        img = self.get(text, font, color, glow)
+        if glow:
+            return surface.blit(img, (x - self.glow_margin, y - self.glow_margin))
+        return surface.blit(img, (x, y))
+
+    def set_glow_margin(self, margin):
+        """Change the glow width, dropping the glow surfaces rendered at the old one"""
+        if margin == self.glow_margin:
+            return
+        self.glow_margin = margin
+        for key in [key for key in self.entries if key[3]]:
+            del self.entries[key]
+
+    def clear(self):
+        """Drop every cached surface"""
+        self.entries.clear()
+
+
+def render_glow(text, font, color, margin=GLOW_MARGIN):
+    """Composite white glow copies offset up to margin pixels and the text into one surface"""
+    glow_surface = font.render(text, True, (255, 255, 255))
+    img = font.render(text, True, color)
+    width, height = img.get_size()
+    composite = pygame.Surface((width + 2 * margin, height + 2 * margin), pygame.SRCALPHA)
+    for dx in range(-margin, margin + 1):
+        for dy in range(-margin, margin + 1):
+            if dx != 0 or dy != 0:
+                composite.blit(glow_surface, (margin + dx, margin + dy))
+    composite.blit(img, (margin, margin))
+    return composite
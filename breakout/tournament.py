@@ -0,0 +1,235 @@
+"""Tournament runner comparing paddle policies over many headless games.
+
+A policy replaces the mouse: it is called every tick with the engine and
+returns the x coordinate the paddle should centre on. Games are spread
+across a process pool, each with its own seed, which picks its generated
+wall and drives the engine's RNG. Results are streamed to a JSONL or CSV
+file as they finish:
+
+    python -m breakout.tournament --policies tracker intercept --games 2000 --output results.jsonl
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import defaultdict
+
+import numpy as np
+
+from .engine import BreakoutEngine
+from .levels import generate_layout
+from .settings import cols, rows, multiball_chance
+
+
+# Fields written for every game
+RESULT_FIELDS = ['policy', 'seed', 'outcome', 'score', 'ticks', 'blocks_destroyed', 'blocks_remaining']
+
+
+def lowest_ball(engine):
+    """Slot of the ball closest to the bottom of the board"""
+    balls = engine.balls
+    return int(np.argmax(balls.y[:balls.count])) if balls.count > 1 else 0
+
+
+def tracker(engine):
+    """Keep the paddle under the lowest ball"""
+    balls = engine.balls
+    return int(balls.x[lowest_ball(engine)]) + balls.width // 2
+
+
+def intercept(engine):
+    """Wait where the next falling ball will cross the paddle, folding in side-wall bounces"""
+    balls = engine.balls
+    paddle_top = engine.player_paddle.rect.top
+    if balls.count == 1:
+        # NumPy calls cost more than the arithmetic for a lone ball
+        ball = 0
+        speed_y = int(balls.speed_y[0])
+        if speed_y <= 0:
+            return tracker(engine)
+        ticks = (paddle_top - balls.height - int(balls.y[0])) / speed_y
+    else:
+        speed_y = balls.speed_y[:balls.count]
+        falling = np.flatnonzero(speed_y > 0)
+        if not len(falling):
+            return tracker(engine)
+        arrivals = (paddle_top - balls.height - balls.y[falling]) / speed_y[falling]
+        best = int(np.argmin(arrivals))
+        ball = falling[best]
+        ticks = float(arrivals[best])
+
+    # Ticks may be negative once the ball overlaps the paddle; the crossing point stays put
+    span = engine.width - balls.width
+    x = (int(balls.x[ball]) + int(balls.speed_x[ball]) * ticks) % (2 * span)
+    if x > span:
+        x = 2 * span - x
+    return round(x) + balls.width // 2
+
+
+POLICIES = {
+    'tracker': tracker,
+    'intercept': intercept,
+}
+
+
+def play(task):
+    """Play one round with a policy and return its result row"""
+    policy_name, seed, config = task
+    policy = POLICIES[policy_name]
+    options = dict(config)
+    max_ticks = options.pop('max_ticks')
+    if not options.pop('classic_layout'):
+        options['layout'] = generate_layout(options.get('cols', cols), options.get('rows', rows), seed)
+    engine = BreakoutEngine(seed=seed, **options)
+    engine.launch()
+
+    result = 0
+    step = engine.step
+    for _ in range(max_ticks):
+        result = step(policy(engine))
+        if result != 0:
+            break
+    outcome = {1: 'clear', -1: 'lost'}.get(result, 'timeout')
+    return {
+        'policy': policy_name,
+        'seed': seed,
+        'outcome': outcome,
+        'score': engine.score,
+        'ticks': engine.ticks,
+        'blocks_destroyed': engine.blocks_destroyed,
+        'blocks_remaining': engine.wall.blocks_remaining,
+    }
+
+
+def tasks(policies, games, seed, config):
+    """Every (policy, seed, config) pair; each policy plays the same seeds"""
+    for game in range(games):
+        for policy in policies:
+            yield policy, seed + game, config
+
+
+class ResultWriter:
+    """Appends result rows to a JSONL file, or a CSV file for a .csv path"""
+    def __init__(self, path):
+        self.handle = open(path, 'w', newline='')
+        self.csv = None
+        if path.endswith('.csv'):
+            self.csv = csv.DictWriter(self.handle, RESULT_FIELDS)
+            self.csv.writeheader()
+
+    def write(self, row):
+        """Write one row and flush so partial runs are still usable"""
+        if self.csv is not None:
+            self.csv.writerow(row)
+        else:
+            self.handle.write(json.dumps(row) + '\n')
+        self.handle.flush()
+
+    def close(self):
+        self.handle.close()
+
+
+def run(policies, games, seed=0, workers=None, config=None, on_result=None):
+    """Play every policy on games seeds across a process pool.
+
+    Results arrive in completion order and are passed to on_result as they
+    come in; the full list is returned at the end.
+    """
+    config = dict(config or {})
+    config.setdefault('max_ticks', 60 * 60 * 10)
+    config.setdefault('classic_layout', False)
+    workers = workers or os.cpu_count() or 1
+    total = games * len(policies)
+    # Large chunks amortise the inter-process round trips; small ones keep the stream flowing
+    chunksize = max(1, min(64, total // (workers * 8)))
+
+    results = []
+    with multiprocessing.Pool(workers) as pool:
+        for row in pool.imap_unordered(play, tasks(policies, games, seed, config), chunksize):
+            results.append(row)
+            if on_result is not None:
+                on_result(row)
+    return results
+
+
+def summarize(results):
+    """Per-policy score, clear-rate and ticks-to-clear distributions"""
+    by_policy = defaultdict(list)
+    for row in results:
+        by_policy[row['policy']].append(row)
+
+    summary = {}
+    for policy, rows_ in by_policy.items():
+        scores = np.array([row['score'] for row in rows_], dtype=np.float64)
+        clear_ticks = np.array([row['ticks'] for row in rows_ if row['outcome'] == 'clear'], dtype=np.float64)
+        entry = {
+            'games': len(rows_),
+            'clear_rate': len(clear_ticks) / len(rows_),
+            'timeouts': sum(row['outcome'] == 'timeout' for row in rows_),
+            'score_mean': float(scores.mean()),
+        }
+        for q, value in zip((10, 50, 90), np.percentile(scores, [10, 50, 90])):
+            entry[f'score_p{q}'] = float(value)
+        if len(clear_ticks):
+            for q, value in zip((10, 50, 90), np.percentile(clear_ticks, [10, 50, 90])):
+                entry[f'clear_ticks_p{q}'] = float(value)
+        summary[policy] = entry
+    return summary
+
+
+def print_summary(summary, elapsed, total):
+    """Print the per-policy table"""
+    print(f'{total} games in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.0f} games/s)')
+    print(f'{"policy":<10} {"games":>6} {"clear":>7} {"score p10/p50/p90":>20} {"mean":>8} '
+          f'{"ticks-to-clear p10/p50/p90":>28}')
+    for policy, entry in summary.items():
+        scores = f'{entry["score_p10"]:.0f}/{entry["score_p50"]:.0f}/{entry["score_p90"]:.0f}'
+        if 'clear_ticks_p50' in entry:
+            ticks = (f'{entry["clear_ticks_p10"]:.0f}/{entry["clear_ticks_p50"]:.0f}/'
+                     f'{entry["clear_ticks_p90"]:.0f}')
+        else:
+            ticks = '-'
+        print(f'{policy:<10} {entry["games"]:>6} {entry["clear_rate"]:>6.1%} {scores:>20} '
+              f'{entry["score_mean"]:>8.1f} {ticks:>28}')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare paddle policies over many headless games')
+    parser.add_argument('--policies', nargs='+', choices=sorted(POLICIES), default=sorted(POLICIES))
+    parser.add_argument('--games', type=int, default=1000, help='games per policy')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the first game')
+    parser.add_argument('--workers', type=int, help='worker processes (all cores by default)')
+    parser.add_argument('--output', metavar='PATH', help='stream results to a .jsonl or .csv file')
+    parser.add_argument('--max-ticks', type=int, default=60 * 60 * 10, help='ticks before a round times out')
+    parser.add_argument('--swept', action='store_true', help='use continuous collisions')
+    parser.add_argument('--ball-speed', type=int, default=4)
+    parser.add_argument('--multiball', type=float, default=0.0, metavar='CHANCE',
+                        help=f'multi-ball chance per destroyed block (the game uses {multiball_chance})')
+    parser.add_argument('--classic-layout', action='store_true',
+                        help='play the classic wall instead of a generated wall per seed')
+    args = parser.parse_args(argv)
+
+    config = {
+        'max_ticks': args.max_ticks,
+        'classic_layout': args.classic_layout,
+        'swept': args.swept,
+        'ball_speed': args.ball_speed,
+        'multiball_chance': args.multiball,
+    }
+    writer = ResultWriter(args.output) if args.output else None
+    start = time.perf_counter()
+    try:
+        results = run(args.policies, args.games, args.seed, args.workers, config,
+                      writer.write if writer else None)
+    finally:
+        if writer is not None:
+            writer.close()
+    print_summary(summarize(results), time.perf_counter() - start, len(results))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
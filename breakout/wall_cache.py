@@ -0,0 +1,116 @@
+"""Pre-rendered wall surfaces that only redraw blocks whose strength changed"""
+from itertools import repeat
+
+import numpy as np
+import pygame
+
+from .palette import block_palette, block_pulse
+from .settings import bg
+
+
+# Color key marking empty cells in the cached wall surfaces
+EMPTY_KEY = (255, 0, 255)
+
+
+def wall_pulse(ticks):
+    """Brightness offset of the animated block pulse at the given time"""
+    return block_pulse.value(ticks)
+
+
+class WallRenderer:
+    """Off-screen wall surfaces, one per pulse phase, built from block tiles.
+
+    The pulse only takes 21 distinct values, so each phase keeps its own
+    wall surface. A block change marks that block dirty in every phase and
+    each phase redraws its dirty blocks the next time it is shown, so a frame
+    normally costs one blit of the whole wall.
+    """
+    def __init__(self, color_for_strength):
+        self.color_for_strength = color_for_strength
+        self.tiles = {}
+        self.layers = {}
+        self.generation = None
+        self.block_size = None
+        self.last_pulse = None
+        self.changed = True
+
+    def tile(self, strength, pulse, target):
+        """Block sprite for a strength and pulse phase, rendered on first use"""
+        key = (strength, pulse)
+        tile = self.tiles.get(key)
+        if tile is None:
+            width, height = self.block_size
+            block_col = self.color_for_strength(strength)
+            tile = pygame.Surface((width, height), 0, target)
+
+            # Animated pulsing effect
+            tile.fill(block_palette.shade(block_col, pulse))
+            pygame.draw.rect(tile, bg, (0, 0, width, height), 2)
+
+            # 3D highlight effect
+            inner_color = block_palette.shade(block_col, 30)
+            pygame.draw.rect(tile, inner_color, (3, 3, width - 6, height - 6))
+            self.tiles[key] = tile
+        return tile
+
+    def mark_dirty(self, row, col):
+        """Schedule a block for redrawing in every cached phase"""
+        for layer in self.layers.values():
+            layer[1].add((row, col))
+        self.changed = True
+
+    def invalidate(self):
+        """Drop every cached surface"""
+        self.tiles.clear()
+        self.layers.clear()
+        self.changed = True
+
+    def draw_block(self, layer, wall, row, col, pulse, target):
+        """Redraw one block of a cached phase surface"""
+        strength = wall.strength_at(row, col)
+        position = (col * wall.width, row * wall.height)
+        if strength:
+            layer.blit(self.tile(strength, pulse, target), position)
+        else:
+            layer.fill(EMPTY_KEY, (position, self.block_size))
+
+    def build_layer(self, wall, pulse, target):
+        """Render the whole wall for one pulse phase"""
+        layer = pygame.Surface((wall.cols * wall.width, wall.rows * wall.height), 0, target)
+        layer.fill(EMPTY_KEY)
+        layer.set_colorkey(EMPTY_KEY)
+        grid = wall.grid
+        # Strengths present, counted with bincount since np.unique imports numpy.ma on first use
+        for strength in (np.flatnonzero(np.bincount(grid.ravel())[1:]) + 1).tolist():
+            tile = self.tile(strength, pulse, target)
+            rows, cols = np.nonzero(grid == strength)
+            layer.blits(zip(repeat(tile), zip((cols * wall.width).tolist(), (rows * wall.height).tolist())),
+                        doreturn=False)
+        return layer
+
+    def draw(self, surface, wall, ticks):
+        """Blit the wall for the current pulse phase.
+
+        Returns the wall's screen rect when its appearance changed since the
+        previous call, otherwise None.
+        """
+        if wall.generation != self.generation or (wall.width, wall.height) != self.block_size:
+            self.invalidate()
+            self.generation = wall.generation
+            self.block_size = (wall.width, wall.height)
+
+        pulse = wall_pulse(ticks)
+        layer = self.layers.get(pulse)
+        if layer is None:
+            layer = [self.build_layer(wall, pulse, surface), set()]
+            self.layers[pulse] = layer
+        elif layer[1]:
+            for row, col in layer[1]:
+                self.draw_block(layer[0], wall, row, col, pulse, surface)
+            layer[1].clear()
+
+        rect = surface.blit(layer[0], (0, 0))
+        changed = self.changed or pulse != self.last_pulse
+        self.last_pulse = pulse
+        self.changed = False
+        return rect if changed else None
@@ -0,0 +1,15 @@
+"""The batched engine's parity with BreakoutEngine"""
+import pytest
+
+from breakout.batch import BatchEngine, check
+from breakout.engine import BreakoutEngine
+
+
+def test_batch_matches_engine():
+    assert check(count=8, ticks=1000, seed=2) is None
+
+
+@pytest.mark.parametrize('config', [{'swept': True}, {'multiball_chance': 0.1}])
+def test_batch_rejects_other_rules(config):
+    with pytest.raises(ValueError):
+        BatchEngine.from_engine(4, BreakoutEngine(**config))
@@ -0,0 +1,40 @@
+"""Dirty-rect updates fall back to a full update only past the area threshold"""
+import pygame
+import pytest
+
+from breakout.dirty_rects import DirtyRects
+
+
+@pytest.fixture
+def updates(monkeypatch):
+    """Arguments of every pygame.display.update call"""
+    calls = []
+    monkeypatch.setattr(pygame.display, 'update', lambda *args: calls.append(args))
+    return calls
+
+
+def frames(dirty, *frame_rects):
+    """Add and flush each frame's rects in turn"""
+    for rects in frame_rects:
+        dirty.add(rects)
+        dirty.flush()
+
+
+def test_region_dirty_in_both_frames_counts_once(updates):
+    dirty = DirtyRects((0, 0, 600, 600))
+    wall = pygame.Rect(0, 0, 600, 300)
+    frames(dirty, [wall], [wall, pygame.Rect(10, 500, 20, 20)], [wall])
+    assert updates[0] == ()
+    assert all(args for args in updates[1:])
+
+
+def test_overlapping_regions_use_their_union(updates):
+    dirty = DirtyRects((0, 0, 600, 600))
+    frames(dirty, [], [pygame.Rect(0, 0, 600, 240), pygame.Rect(0, 60, 600, 240)])
+    assert updates[-1] != ()
+
+
+def test_large_union_falls_back_to_a_full_update(updates):
+    dirty = DirtyRects((0, 0, 600, 600))
+    frames(dirty, [], [pygame.Rect(0, 0, 600, 200)], [pygame.Rect(0, 300, 600, 200)])
+    assert updates[-1] == ()
@@ -0,0 +1,51 @@
+"""Level files: round trips, malformed files and fitting them to a board"""
+import pytest
+
+from breakout.engine import BreakoutEngine, LevelError
+from breakout.levels import HEADER, MAGIC, VERSION, generate_layout, load_level, save_level
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'wall.lvl')
+    strength = generate_layout(30, 12, seed=1)
+    save_level(path, 30, 12, 20, 10, strength)
+    level = load_level(path)
+    assert (level.cols, level.rows, level.block_width, level.block_height) == (30, 12, 20, 10)
+    assert bytes(level.strength) == strength
+
+    engine = BreakoutEngine.from_level(level, 600, 600)
+    assert engine.block_state() == strength
+    assert engine.wall.width == 20
+
+
+def write(path, data):
+    with open(path, 'wb') as handle:
+        handle.write(data)
+    return path
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'BRKL',
+    HEADER.pack(b'XXXX', VERSION, 2, 2, 10, 10) + bytes(4),
+    HEADER.pack(MAGIC, VERSION + 1, 2, 2, 10, 10) + bytes(4),
+    HEADER.pack(MAGIC, VERSION, 2, 2, 10, 10) + bytes(3),
+    HEADER.pack(MAGIC, VERSION, 2, 2, 0, 10) + bytes(4),
+    HEADER.pack(MAGIC, VERSION, 2, 2, 10, 0) + bytes(4),
+    HEADER.pack(MAGIC, VERSION, 0, 0, 10, 10),
+], ids=['empty', 'short', 'magic', 'version', 'size', 'zero width', 'zero height', 'no blocks'])
+def test_malformed_files_raise_level_error(tmp_path, data):
+    with pytest.raises(LevelError):
+        load_level(write(str(tmp_path / 'bad.lvl'), data))
+
+
+def test_missing_file_raises_level_error(tmp_path):
+    with pytest.raises(LevelError):
+        load_level(str(tmp_path / 'missing.lvl'))
+
+
+def test_levels_that_cannot_fit_are_rejected(tmp_path):
+    path = str(tmp_path / 'wide.lvl')
+    save_level(path, 1000, 2, 1, 1, bytes(2000))
+    with pytest.raises(LevelError):
+        BreakoutEngine.from_level(load_level(path), 600, 600)
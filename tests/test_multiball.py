@@ -0,0 +1,90 @@
+"""Vectorized multi-ball ticks against the scalar ball physics"""
+import numpy as np
+import pytest
+
+from breakout.engine import BreakoutEngine, game_ball
+from breakout.settings import trail_length
+
+
+def fill_balls(engine, count):
+    """Launch and split balls until count are in play"""
+    engine.launch()
+    while len(engine.balls) < count:
+        engine.multiball_pending = 1
+        engine.split_balls()
+
+
+def scalar_step(engine, paddle_x):
+    """One tick with every ball taking the scalar physics in slot order"""
+    engine.events.clear()
+    engine.ticks += 1
+    engine.player_paddle.move(paddle_x)
+    balls = engine.balls
+    balls.push_trails()
+    ball = game_ball(0, 0)
+    for i in range(len(balls)):
+        balls.load(i, ball)
+        if engine.swept:
+            ball.move_swept(engine)
+        else:
+            ball.move(engine)
+        balls.store(i, ball)
+    in_play = balls.game_over[:balls.count] != -1
+    if in_play.any():
+        balls.keep(in_play)
+
+
+def ball_state(engine):
+    """Every ball's fields and trail, comparable across engines"""
+    balls = engine.balls
+    count = balls.count
+    fields = [values[:count].tolist() for values in balls.fields[:-1]]
+    return fields, balls.trail_points(trail_length).tolist()
+
+
+@pytest.mark.parametrize('config', [{}, {'swept': True, 'substeps': 2, 'ball_speed': 9}])
+def test_vectorized_pass_matches_scalar_physics(config):
+    engine = BreakoutEngine(seed=3, max_balls=200, ball_collisions=False, **config)
+    reference = BreakoutEngine(seed=3, max_balls=200, ball_collisions=False, **config)
+    fill_balls(engine, 200)
+    fill_balls(reference, 200)
+    for tick in range(150):
+        paddle_x = (tick * 37) % 600
+        if engine.step(paddle_x):
+            break
+        scalar_step(reference, paddle_x)
+        assert ball_state(engine) == ball_state(reference), f'balls differ at tick {tick}'
+        assert engine.score == reference.score
+        assert engine.block_state() == reference.block_state()
+    assert tick > 20
+
+
+def place(engine, x, y, speed_x, speed_y):
+    """Put balls at the given positions and speeds"""
+    balls = engine.balls
+    balls.count = len(x)
+    balls.x[:balls.count] = x
+    balls.y[:balls.count] = y
+    balls.speed_x[:balls.count] = speed_x
+    balls.speed_y[:balls.count] = speed_y
+
+
+def test_ball_exchanges_with_its_first_partner_only():
+    engine = BreakoutEngine()
+    # The middle ball closes on both neighbours, so only the first pair in sweep order exchanges
+    place(engine, [100, 110, 120], [300, 300, 300], [3, 0, -3], [0, 0, 0])
+    engine.collide_balls()
+    assert engine.balls.speed_x[:3].tolist() == [0, 3, -3]
+
+
+def test_clump_exchanges_only_with_balls_elsewhere():
+    engine = BreakoutEngine()
+    rng = np.random.default_rng(0)
+    # 100 coincident balls never bounce off each other, but the pair beside them does
+    clump = rng.integers(-5, 6, (2, 100))
+    place(engine, [200] * 100 + [400, 410], [200] * 100 + [300, 300],
+          clump[0].tolist() + [2, -2], clump[1].tolist() + [0, 0])
+    engine.collide_balls()
+    assert engine.balls.speed_x[:100].tolist() == clump[0].tolist()
+    assert engine.balls.speed_y[:100].tolist() == clump[1].tolist()
+    assert engine.balls.speed_x[100:102].tolist() == [-2, 2]
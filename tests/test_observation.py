@@ -0,0 +1,82 @@
+"""Pixel observations: frame stacking, grayscale and deterministic episodes"""
+import numpy as np
+import pygame
+import pytest
+
+from breakout.observation import LUMA_WEIGHTS, ObservationPipeline, PixelGame, screen_pixels
+
+
+def filled(surface, value):
+    """Fill the surface with a gray level, which shows up in every channel"""
+    surface.fill((value, value, value))
+
+
+def test_stack_is_oldest_first_and_wraps_around():
+    surface = pygame.Surface((8, 6), 0, 32)
+    pipeline = ObservationPipeline(surface, grayscale=True, stack=3)
+    filled(surface, 10)
+    observation = pipeline.observe()
+    assert observation[:, 0, 0].tolist() == [10, 10, 10]
+
+    seen = []
+    for value in range(20, 100, 10):
+        filled(surface, value)
+        seen.append(value)
+        observation = pipeline.observe()
+        assert observation.shape == pipeline.shape == (3, 6, 8)
+        assert observation[:, 0, 0].tolist() == ([10, 10, 10] + seen)[-3:]
+
+    pipeline.reset()
+    filled(surface, 5)
+    assert pipeline.observe()[:, 0, 0].tolist() == [5, 5, 5]
+
+
+def test_grayscale_matches_reference_luma():
+    rng = np.random.default_rng(0)
+    surface = pygame.Surface((40, 30), 0, 32)
+    pixels = rng.integers(0, 256, (30, 40, 3), dtype=np.uint8)
+    pygame.surfarray.blit_array(surface, pixels.transpose(1, 0, 2))
+
+    observation = ObservationPipeline(surface, grayscale=True, downsample=2).observe()
+    sampled = pixels[::2, ::2].astype(np.uint32)
+    red, green, blue = LUMA_WEIGHTS
+    reference = (sampled[..., 0] * red + sampled[..., 1] * green + sampled[..., 2] * blue) >> 8
+    assert np.array_equal(observation[0], reference)
+
+
+def test_rgb_observation_matches_the_screen():
+    surface = pygame.Surface((16, 12), 0, 32)
+    surface.fill((200, 100, 50))
+    surface.fill((1, 2, 3), pygame.Rect(4, 4, 4, 4))
+    observation = ObservationPipeline(surface, downsample=2, stack=2).observe()
+    pixels = screen_pixels(surface)
+    assert np.array_equal(observation[-1], pixels[::2, ::2])
+    del pixels
+
+
+@pytest.fixture(scope='module')
+def fonts():
+    pygame.font.init()
+
+
+def episode(game, actions):
+    """Observations of one episode, copied"""
+    observations = [game.reset().copy()]
+    for paddle_x in actions:
+        observation, _, done = game.step(paddle_x)
+        observations.append(observation.copy())
+        if done:
+            break
+    return observations
+
+
+def test_reset_episodes_with_the_same_seed_match(fonts):
+    actions = [(tick * 53) % 600 for tick in range(60)]
+    game = PixelGame(frame_skip=4, seed=3)
+    first = episode(game, actions)
+    second = episode(game, actions)
+    other = episode(PixelGame(frame_skip=4, seed=3), actions)
+    assert len(first) == len(second) == len(other)
+    for a, b, c in zip(first, second, other):
+        assert np.array_equal(a, b)
+        assert np.array_equal(a, c)
@@ -0,0 +1,34 @@
+"""The particle pool's fixed capacity and oldest-first eviction"""
+import numpy as np
+
+from breakout.particles import ParticlePool
+
+
+def test_full_pool_evicts_the_oldest_particles():
+    pool = ParticlePool(capacity=50, rng=np.random.default_rng(0))
+    for burst in range(8):
+        pool.spawn(burst, 0, (255, 0, 0), 10)
+        assert len(pool) <= pool.capacity
+    # Bursts 3 to 7 survive, oldest first
+    assert len(pool) == 50
+    assert pool.x[:pool.count].tolist() == [float(burst) for burst in range(3, 8) for _ in range(10)]
+
+
+def test_burst_larger_than_the_pool_is_clipped():
+    pool = ParticlePool(capacity=20, rng=np.random.default_rng(0))
+    pool.spawn(0, 0, (0, 0, 255), 15)
+    pool.spawn(1, 0, (0, 255, 0), 100)
+    assert len(pool) == 20
+    assert set(pool.x[:pool.count].tolist()) == {1.0}
+
+
+def test_update_keeps_spawn_order_and_drops_expired():
+    pool = ParticlePool(capacity=100, rng=np.random.default_rng(0))
+    pool.spawn(0, 0, (255, 0, 0), 10)
+    for _ in range(10):
+        pool.update()
+    pool.spawn(5, 0, (0, 255, 0), 10)
+    for _ in range(pool.max_life - 10):
+        pool.update()
+    assert len(pool) == 10
+    assert all(pool.colors[index] == (0, 255, 0) for index in pool.color[:pool.count])
@@ -0,0 +1,52 @@
+"""Hysteresis of the adaptive quality controller"""
+from breakout.quality import QUALITY_LEVELS, QualityController
+
+
+def feed(controller, frame_ms, frames):
+    """Frames after which the level changed"""
+    return [frame for frame in range(frames) if controller.update(frame_ms)]
+
+
+def test_steps_down_only_after_a_full_window():
+    controller = QualityController(60, window=30)
+    top = len(QUALITY_LEVELS) - 1
+    assert controller.level == top
+    assert feed(controller, 16.0, 29) == []
+    assert feed(controller, 16.0, 1) == [0]
+    assert controller.level == top - 1
+
+    # Each level is judged on its own frames
+    assert feed(controller, 16.0, 29) == []
+    assert controller.level == top - 1
+
+
+def test_steps_up_only_after_staying_calm():
+    controller = QualityController(60, level=0, window=30, raise_after=120)
+    # The window has to fill before the calm frames start counting
+    assert feed(controller, 2.0, 29 + 119) == []
+    assert feed(controller, 2.0, 1) == [0]
+    assert controller.level == 1
+
+
+def test_frame_times_between_thresholds_hold_the_level():
+    controller = QualityController(60, level=2, window=30)
+    budget = 1000.0 / 60
+    assert feed(controller, 0.7 * budget, 1000) == []
+    assert controller.level == 2
+
+
+def test_a_slow_frame_resets_the_calm_count():
+    controller = QualityController(60, level=0, window=10, raise_after=20)
+    feed(controller, 2.0, 25)
+    controller.update(70.0)
+    assert feed(controller, 2.0, 15) == []
+    assert controller.level == 0
+
+
+def test_levels_stay_in_range():
+    controller = QualityController(60, level=0, window=5)
+    assert feed(controller, 50.0, 100) == []
+    assert controller.level == 0
+    controller = QualityController(60, window=5, raise_after=5)
+    assert feed(controller, 0.1, 100) == []
+    assert controller.name == QUALITY_LEVELS[-1].name
@@ -0,0 +1,73 @@
+"""Recording, rewinding and replaying sessions"""
+import pytest
+
+from breakout.engine import BreakoutEngine
+from breakout.replay import ReplayError, ReplayRecorder, encode, replay
+from breakout.snapshot import RewindBuffer
+
+
+def paddle_input(tick):
+    """Deterministic paddle sweep across the board"""
+    return (tick * 37) % 600
+
+
+def record(recorder, ticks, start=0, stride=1):
+    """Step the recorder with the scripted input, relaunching ended rounds"""
+    for tick in range(start, start + ticks):
+        if recorder.step(paddle_input(tick * stride)):
+            recorder.launch()
+
+
+def log(recorder):
+    """The bytes ReplayRecorder.save would write"""
+    return encode(recorder.seed, recorder.config, recorder.layout, recorder.inputs, recorder.launches,
+                  recorder.engine)
+
+
+@pytest.mark.parametrize('config', [{}, {'swept': True, 'ball_speed': 9, 'multiball_chance': 0.3}])
+def test_replay_reaches_the_recorded_state(config):
+    engine = BreakoutEngine(seed=4, **config)
+    recorder = ReplayRecorder(engine)
+    recorder.launch()
+    record(recorder, 2000)
+    replayed, expected, matches = replay(log(recorder))
+    assert matches
+    assert replayed.score == engine.score == expected['score']
+
+
+def test_rewound_truncated_replay_verifies():
+    engine = BreakoutEngine(seed=5)
+    recorder = ReplayRecorder(engine)
+    history = RewindBuffer(engine, 300)
+    recorder.launch()
+    for tick in range(500):
+        if recorder.step(paddle_input(tick)):
+            recorder.launch()
+        history.record()
+
+    assert history.rewind(120) == 120
+    recorder.truncate(engine.ticks)
+    assert len(recorder.inputs) == engine.ticks == 380
+
+    record(recorder, 320, 380, stride=3)
+    replayed, expected, matches = replay(log(recorder))
+    assert matches
+    assert replayed.score == engine.score == expected['score']
+    assert replayed.block_state() == engine.block_state()
+
+
+@pytest.mark.parametrize('config', [{'ball_speed': 300}, {'cols': 1000, 'width': 100000}])
+def test_recorder_refuses_configs_the_log_cannot_hold(config):
+    with pytest.raises(ReplayError):
+        ReplayRecorder(BreakoutEngine(**config))
+
+
+def test_corrupt_log_is_rejected():
+    recorder = ReplayRecorder(BreakoutEngine(seed=1))
+    recorder.launch()
+    record(recorder, 50)
+    data = log(recorder)
+    with pytest.raises(ReplayError):
+        replay(data[:10])
+    with pytest.raises(ReplayError):
+        replay(b'XXXX' + data[4:])
@@ -0,0 +1,92 @@
+"""Idle frame pacing of the frame scheduler"""
+import pygame
+import pytest
+
+from breakout.scheduler import FrameScheduler
+
+
+class Timer:
+    """Fake millisecond timer behind pygame.time.get_ticks"""
+    now = 0
+
+
+class FakeClock:
+    """pygame.time.Clock stand-in that advances a fake millisecond timer"""
+    def __init__(self, timer, frame_ms):
+        self.timer = timer
+        self.frame_ms = frame_ms
+        self.rates = []
+        self.last = 0
+
+    def tick(self, framerate=0):
+        """Sleep a frame when capped, then return the milliseconds since the last tick"""
+        self.rates.append(framerate)
+        if framerate:
+            self.timer.now += self.frame_ms
+        elapsed = self.timer.now - self.last
+        self.last = self.timer.now
+        return elapsed
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    timer = Timer()
+    events = []
+    monkeypatch.setattr(pygame.time, 'get_ticks', lambda: timer.now)
+
+    def wait(timeout):
+        timer.now += timeout
+        return events.pop(0) if events else pygame.event.Event(pygame.NOEVENT)
+    monkeypatch.setattr(pygame.event, 'wait', wait)
+    monkeypatch.setattr(pygame.event, 'post', lambda event: None)
+    scheduler = FrameScheduler(FakeClock(timer, 16), fps=60, idle_fps=15, idle_delay=1000)
+    scheduler.timer = timer
+    scheduler.events = events
+    return scheduler
+
+
+def test_goes_idle_after_the_delay_only_when_settled(scheduler):
+    for _ in range(100):
+        scheduler.tick(settled=False)
+    assert not scheduler.idle
+
+    scheduler.wake()
+    while scheduler.timer.now - scheduler.last_input < 1000:
+        scheduler.tick(settled=True)
+        assert not scheduler.idle
+    scheduler.tick(settled=True)
+    assert scheduler.idle
+    assert scheduler.clock.rates[-1] == 0
+
+
+def test_idle_frames_are_spaced_by_the_idle_rate(scheduler):
+    scheduler.timer.now = 5000
+    scheduler.tick(settled=True)
+    start = scheduler.timer.now
+    scheduler.tick(settled=True)
+    assert scheduler.idle
+    assert scheduler.timer.now - start == 1000 // 15
+
+
+def test_input_ends_idle(scheduler):
+    scheduler.timer.now = 5000
+    scheduler.tick(settled=True)
+    assert scheduler.idle
+
+    scheduler.events.append(pygame.event.Event(pygame.MOUSEMOTION, pos=(0, 0), rel=(1, 0), buttons=(0, 0, 0)))
+    scheduler.tick(settled=True)
+    scheduler.tick(settled=True)
+    assert not scheduler.idle
+    assert scheduler.clock.rates[-1] == 60
+
+    scheduler.tick(settled=True)
+    scheduler.handle_event(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE))
+    scheduler.tick(settled=True)
+    assert not scheduler.idle
+
+
+def test_zero_idle_rate_never_idles(scheduler):
+    scheduler.idle_interval = None
+    scheduler.timer.now = 100000
+    scheduler.tick(settled=True)
+    assert not scheduler.idle
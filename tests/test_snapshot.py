@@ -0,0 +1,106 @@
+"""Snapshot round-trips"""
+import numpy as np
+import pytest
+
+from breakout.engine import BreakoutEngine
+from breakout.particles import ParticlePool
+from breakout.snapshot import SnapshotError, load_checkpoint, restore, save_checkpoint, snapshot
+
+
+CONFIGS = {
+    'single': {},
+    'multiball': {'multiball_chance': 0.5, 'max_balls': 50},
+    'swept': {'swept': True, 'substeps': 2, 'ball_speed': 9},
+}
+
+
+def paddle_input(tick):
+    """Deterministic paddle sweep across the board"""
+    return (tick * 37) % 600
+
+
+def play(engine, ticks, start=0):
+    """Step ticks with the scripted input, relaunching ended rounds"""
+    for tick in range(start, start + ticks):
+        if engine.step(paddle_input(tick)):
+            engine.launch()
+
+
+@pytest.mark.parametrize('name', sorted(CONFIGS))
+def test_round_trip_continues_identically(name):
+    engine = BreakoutEngine(seed=1, **CONFIGS[name])
+    engine.launch()
+    play(engine, 400)
+    if engine.multiball_chance:
+        assert len(engine.balls) > 1
+    state = snapshot(engine)
+
+    copy = BreakoutEngine(seed=99, **CONFIGS[name])
+    restore(copy, state)
+    assert snapshot(copy) == state
+
+    play(engine, 600, 400)
+    play(copy, 600, 400)
+    assert snapshot(copy) == snapshot(engine)
+    assert copy.score == engine.score
+
+
+
+def pool_state(particles):
+    """Live particles with their colors resolved, comparable across pools"""
+    count = particles.count
+    colors = [particles.colors[index] for index in particles.color[:count]]
+    return [values[:count].tolist() for values in (particles.x, particles.y, particles.life)] + [colors]
+
+
+def test_particles_round_trip():
+    particles = ParticlePool(100, np.random.default_rng(0))
+    particles.spawn(10, 20, (255, 0, 0), 30)
+    particles.spawn(50, 60, (0, 255, 0), 30)
+    engine = BreakoutEngine(seed=2)
+    state = snapshot(engine, particles)
+
+    copy = ParticlePool(100)
+    copy.color_index((0, 255, 0))
+    restore(BreakoutEngine(seed=2), state, copy)
+    assert pool_state(copy) == pool_state(particles)
+
+
+def test_truncated_snapshot_leaves_the_engine_alone():
+    engine = BreakoutEngine(seed=1, multiball_chance=0.5, max_balls=50)
+    engine.launch()
+    play(engine, 400)
+    particles = ParticlePool(100, np.random.default_rng(0))
+    particles.spawn(10, 20, (255, 0, 0), 30)
+    state = snapshot(engine, particles)
+
+    target = BreakoutEngine(seed=1, multiball_chance=0.5, max_balls=50)
+    target.launch()
+    play(target, 50)
+    pool = ParticlePool(100)
+    before = snapshot(target, pool)
+    for end in range(0, len(state), 7):
+        with pytest.raises(SnapshotError):
+            restore(target, state[:end], pool)
+        assert snapshot(target, pool) == before
+
+
+def test_checkpoint_round_trip_with_particles(tmp_path):
+    engine = BreakoutEngine(seed=6)
+    engine.launch()
+    play(engine, 300)
+    particles = ParticlePool(100, np.random.default_rng(0))
+    particles.spawn(10, 20, (255, 0, 0), 30)
+    path = str(tmp_path / 'game.brks')
+    save_checkpoint(path, engine, particles)
+
+    pool = ParticlePool(100)
+    resumed = load_checkpoint(path, pool)
+    assert snapshot(resumed, pool) == snapshot(engine, particles)
+
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    with open(path, 'wb') as handle:
+        handle.write(data[:len(data) // 2])
+    with pytest.raises(SnapshotError):
+        load_checkpoint(path)
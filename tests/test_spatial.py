@@ -0,0 +1,26 @@
+"""The block grid index agrees with a brute-force scan"""
+import random
+
+from pygame import Rect
+
+from breakout.engine import BreakoutEngine
+
+
+def brute_force(wall, rect):
+    """(row, col) of every live block overlapping rect, in row-major order"""
+    return [(row, col) for row in range(wall.rows) for col in range(wall.cols)
+            if wall.strength_at(row, col) and rect.colliderect(wall.block_rect(row, col))]
+
+
+def test_query_matches_brute_force():
+    rng = random.Random(0)
+    engine = BreakoutEngine(cols=12, rows=8, block_height=25, seed=0)
+    wall = engine.wall
+    for row in range(wall.rows):
+        for col in range(wall.cols):
+            if rng.random() < 0.3:
+                wall.destroy_block(row, col)
+
+    for _ in range(2000):
+        rect = Rect(rng.randint(-40, 620), rng.randint(-40, 300), rng.randint(1, 120), rng.randint(1, 120))
+        assert wall.index.query(rect) == brute_force(wall, rect)
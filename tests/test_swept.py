@@ -0,0 +1,25 @@
+"""Swept collisions keep fast balls out of the blocks"""
+import pytest
+
+from breakout.engine import BreakoutEngine
+
+
+def live_blocks(engine):
+    """Rects of every block still standing"""
+    wall = engine.wall
+    return [wall.block_rect(row, col) for row in range(wall.rows) for col in range(wall.cols)
+            if wall.strength_at(row, col)]
+
+
+@pytest.mark.parametrize('speed, substeps', [(20, 1), (30, 2)])
+def test_fast_swept_ball_never_overlaps_a_block(speed, substeps):
+    engine = BreakoutEngine(seed=7, swept=True, ball_speed=speed, substeps=substeps)
+    engine.launch()
+    for tick in range(3000):
+        game_over = engine.step(engine.ball.rect.centerx)
+        blocks = live_blocks(engine)
+        for ball in engine.balls:
+            assert ball.rect.collidelist(blocks) == -1, f'ball inside a block at tick {tick}'
+        if game_over:
+            engine.launch()
+    assert engine.score > 0
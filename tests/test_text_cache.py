@@ -0,0 +1,39 @@
+"""LRU behaviour of the rendered text cache"""
+import pygame
+import pytest
+
+from breakout.text_cache import TextCache
+
+
+@pytest.fixture(scope='module')
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 20)
+
+
+def test_hit_returns_the_same_surface(font):
+    cache = TextCache()
+    surface = cache.get('SCORE 10', font, (255, 255, 255))
+    assert cache.get('SCORE 10', font, (255, 255, 255)) is surface
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get('SCORE 10', font, (255, 0, 0)) is not surface
+
+
+def test_least_recently_used_entry_is_evicted(font):
+    cache = TextCache(capacity=3)
+    first = cache.get('a', font, (255, 255, 255))
+    cache.get('b', font, (255, 255, 255))
+    cache.get('c', font, (255, 255, 255))
+    assert cache.get('a', font, (255, 255, 255)) is first
+    cache.get('d', font, (255, 255, 255))
+    assert len(cache) == 3
+    assert ('b', font, (255, 255, 255), False) not in cache.entries
+    assert cache.get('a', font, (255, 255, 255)) is first
+
+
+def test_glow_surface_is_composited_with_its_margin(font):
+    cache = TextCache(glow_margin=2)
+    plain = cache.get('GAME OVER', font, (255, 0, 0))
+    glow = cache.get('GAME OVER', font, (255, 0, 0), glow=True)
+    assert glow.get_size() == (plain.get_width() + 4, plain.get_height() + 4)
+    assert cache.size('GAME OVER', font, (255, 0, 0), glow=True) == plain.get_size()